@@ -6,16 +6,18 @@ Run: python3 check_balance.py [--env /path/to/.env]
 
 import os
 import sys
-import time
 import argparse
 from pathlib import Path
 from dotenv import load_dotenv
-from web3 import Web3
+
+from rpc import eth_balance_call, balance_of_call, allowance_call, batch_read, make_web3, checksum
+import rpc_cache
 
 # Parse command line arguments first
 parser = argparse.ArgumentParser(description='Check USDC balance and allowances')
 parser.add_argument('--env', type=str, help='Path to .env file (default: .env in current dir)')
-args = parser.parse_args()
+# Only read the command line when run as a script (telegram_bot imports this module)
+args = parser.parse_args() if __name__ == "__main__" else parser.parse_args([])
 
 # Load .env from specified path or default
 if args.env:
@@ -47,44 +49,18 @@ CTF_EXCHANGE = "0x4bFb41d5B3570DeFd03C39a9A4D8dE6Bd8B8982E"  # CTF Exchange
 NEG_RISK_CTF_EXCHANGE = "0xC5d563A36AE78145C45a50134d48A1215220f80a"  # NegRisk CTF Exchange
 NEG_RISK_ADAPTER = "0xd91E80cF2E7be2e162c6513ceD06f1dD0dA35296"  # NegRisk Adapter
 
-# ERC20 ABI (just the functions we need)
-ERC20_ABI = [
-    {
-        "constant": True,
-        "inputs": [{"name": "_owner", "type": "address"}],
-        "name": "balanceOf",
-        "outputs": [{"name": "balance", "type": "uint256"}],
-        "type": "function"
-    },
-    {
-        "constant": True,
-        "inputs": [
-            {"name": "_owner", "type": "address"},
-            {"name": "_spender", "type": "address"}
-        ],
-        "name": "allowance",
-        "outputs": [{"name": "remaining", "type": "uint256"}],
-        "type": "function"
-    },
-    {
-        "constant": True,
-        "inputs": [],
-        "name": "symbol",
-        "outputs": [{"name": "", "type": "string"}],
-        "type": "function"
-    },
-    {
-        "constant": True,
-        "inputs": [],
-        "name": "decimals",
-        "outputs": [{"name": "", "type": "uint8"}],
-        "type": "function"
-    }
-]
+# Checksummed once at import (checksum() caches the keccak per address)
+CTF_EXCHANGE_CS = checksum(CTF_EXCHANGE)
+NEG_RISK_CTF_EXCHANGE_CS = checksum(NEG_RISK_CTF_EXCHANGE)
+NEG_RISK_ADAPTER_CS = checksum(NEG_RISK_ADAPTER)
+
+# Raw allowances above this are "unlimited" approvals (MAX_UINT256 in practice).
+# Compared on the raw integer so it holds for 6- and 18-decimal tokens alike.
+UNLIMITED_ALLOWANCE = 10 ** 24
 
 
 def format_amount(amount, decimals=6):
-    """Format token amount with decimals."""
+    """Format token amount with decimals (display only)."""
     return amount / (10 ** decimals)
 
 
@@ -100,11 +76,7 @@ def check_balance():
     funder_address = os.getenv("FUNDER_ADDRESS", "")
     
     # Get wallet address from private key
-    w3 = Web3(Web3.HTTPProvider(POLYGON_RPC))
-    
-    if not w3.is_connected():
-        print("ERROR: Cannot connect to Polygon RPC")
-        return
+    w3 = make_web3(POLYGON_RPC)
     
     account = w3.eth.account.from_key(private_key)
     eoa_address = account.address  # EOA address from PRIVATE_KEY
@@ -120,7 +92,7 @@ def check_balance():
         if not funder_address:
             print(f"ERROR: SIGNATURE_TYPE={signature_type} requires FUNDER_ADDRESS in .env")
             return
-        wallet = funder_address
+        wallet = checksum(funder_address)
         wallet_type = f"Proxy Wallet (SIGNATURE_TYPE={signature_type})"
         show_both = True  # Show both EOA and Proxy balances
     
@@ -133,45 +105,110 @@ def check_balance():
         print(f"EOA Wallet (REDEEM):     {eoa_address}")
         print(f"\n{'='*60}\n")
     
-    # Helper function to check balances on an address
+    usdc_tokens = [
+        ("USDC (Bridged)", USDC_ADDRESS),
+        ("USDC.e (Native)", USDC_E_ADDRESS),
+    ]
+    
+    exchanges = [
+        ("CTF Exchange", CTF_EXCHANGE_CS),
+        ("NegRisk CTF Exchange", NEG_RISK_CTF_EXCHANGE_CS),
+        ("NegRisk Adapter", NEG_RISK_ADAPTER_CS),
+    ]
+    
+    wallets_to_check = [wallet, eoa_address] if show_both else [wallet]
+    
+    # Batch every read (MATIC + USDC balances, all allowances) into one Multicall3 call
+    # (falls back to parallel eth_calls if Multicall3 is unavailable).
+    # Calldata is built from precomputed selectors - no Contract objects needed.
+    # Allowances rarely change - reuse values cached by a recent run (see rpc_cache.py)
+    allowance_keys = {
+        (address, exchange_addr): rpc_cache.allowance_key(wallet, address, exchange_addr)
+        for _, address in usdc_tokens
+        for _, exchange_addr in exchanges
+    }
+    allowance_values = {}
+    for pair, key in allowance_keys.items():
+        cached = rpc_cache.get(key, ttl=rpc_cache.ALLOWANCE_TTL)
+        if cached is not None:
+            allowance_values[pair] = cached[0]
+    cached_count = len(allowance_values)
+    
+    calls = []
+    for addr in wallets_to_check:
+        calls.append(eth_balance_call(addr))
+        for _, address in usdc_tokens:
+            calls.append(balance_of_call(address, addr))
+    allowance_pairs = [pair for pair in allowance_keys if pair not in allowance_values]
+    for address, exchange_addr in allowance_pairs:
+        calls.append(allowance_call(address, wallet, exchange_addr))
+    
+    # No separate is_connected() probe - an unreachable RPC shows up as every read failing
+    results = batch_read(w3, calls)
+    if all(result is None for result in results):
+        print("ERROR: Cannot connect to Polygon RPC")
+        return
+    results = iter(results)
+    
+    wallet_reads = {}
+    for addr in wallets_to_check:
+        matic_balance = next(results)
+        token_balances = [next(results) for _ in usdc_tokens]
+        wallet_reads[addr] = (matic_balance, token_balances)
+    
+    fresh_allowances = {}
+    stale_count = 0
+    for pair in allowance_pairs:
+        allowance = next(results)
+        if allowance is not None:
+            fresh_allowances[allowance_keys[pair]] = allowance
+        else:
+            # Read failed - fall back to an expired cache entry if there is one
+            stale = rpc_cache.get(allowance_keys[pair])
+            if stale is not None:
+                allowance = stale[0]
+                stale_count += 1
+        allowance_values[pair] = allowance
+    rpc_cache.put_many(fresh_allowances)
+    
+    allowances = {
+        address: [allowance_values[(address, exchange_addr)] for _, exchange_addr in exchanges]
+        for _, address in usdc_tokens
+    }
+    
+    # Helper function to print balances on an address
     def check_wallet_usdc(addr, label):
-        """Check USDC balances on a specific address."""
+        """Print USDC balances on a specific address."""
         print(f"\n--- {label} ---")
         print(f"Address: {addr}\n")
         
-        # Check MATIC balance
-        matic_balance = w3.eth.get_balance(addr)
-        print(f"MATIC Balance: {w3.from_wei(matic_balance, 'ether'):.4f} MATIC")
-        print()
-        time.sleep(0.5)
+        matic_balance, token_balances = wallet_reads[addr]
         
-        # Check USDC tokens
-        usdc_tokens = [
-            ("USDC (Bridged)", USDC_ADDRESS),
-            ("USDC.e (Native)", USDC_E_ADDRESS),
-        ]
+        # MATIC balance
+        if matic_balance is None:
+            print("MATIC Balance: Error - call failed")
+        else:
+            print(f"MATIC Balance: {w3.from_wei(matic_balance, 'ether'):.4f} MATIC")
+        print()
         
         total = 0
         bridged = 0
         native = 0
         
-        for name, address in usdc_tokens:
-            try:
-                contract = w3.eth.contract(address=Web3.to_checksum_address(address), abi=ERC20_ABI)
-                balance = contract.functions.balanceOf(addr).call()
-                formatted = format_amount(balance)
-                total += formatted
-                
-                if address == USDC_ADDRESS:
-                    bridged = formatted
-                elif address == USDC_E_ADDRESS:
-                    native = formatted
-                
-                print(f"{name}: ${formatted:,.2f}")
-                time.sleep(0.5)
-            except Exception as e:
-                print(f"{name}: Error - {e}")
-                time.sleep(0.5)
+        for (name, address), balance in zip(usdc_tokens, token_balances):
+            if balance is None:
+                print(f"{name}: Error - call failed")
+                continue
+            
+            formatted = format_amount(balance)
+            total += formatted
+            
+            if address == USDC_ADDRESS:
+                bridged = formatted
+            elif address == USDC_E_ADDRESS:
+                native = formatted
+            
+            print(f"{name}: ${formatted:,.2f}")
         
         print(f"\nTotal USDC: ${total:,.2f}")
         return total, bridged, native
@@ -200,74 +237,48 @@ def check_balance():
     
     print()
     
-    # Check allowances for the main USDC token
-    time.sleep(0.5)  # Pause before checking allowances
+    # Allowances for the main USDC token
     print(f"{'='*60}")
     print("USDC Allowances (for trading)")
     print(f"{'='*60}\n")
     
-    usdc_contract = w3.eth.contract(address=Web3.to_checksum_address(USDC_ADDRESS), abi=ERC20_ABI)
-    
-    exchanges = [
-        ("CTF Exchange", CTF_EXCHANGE),
-        ("NegRisk CTF Exchange", NEG_RISK_CTF_EXCHANGE),
-        ("NegRisk Adapter", NEG_RISK_ADAPTER),
-    ]
-    
-    for name, exchange_addr in exchanges:
-        try:
-            allowance = usdc_contract.functions.allowance(wallet, Web3.to_checksum_address(exchange_addr)).call()
-            formatted = format_amount(allowance)
-            
-            if allowance == 0:
-                status = "NOT SET"
-            elif formatted > 1000000000:  # Max uint256 / 1e6
-                status = "UNLIMITED"
-            else:
-                status = f"${formatted:,.2f}"
-            
-            icon = "OK" if allowance > 0 else "NEEDS APPROVAL"
-            print(f"{name}:")
-            print(f"  Address: {exchange_addr}")
-            print(f"  Allowance: {status} [{icon}]")
-            print()
-            time.sleep(0.5)  # Pause to avoid rate limits
-        except Exception as e:
-            print(f"{name}: Error - {e}")
-            time.sleep(0.5)
+    for (name, exchange_addr), allowance in zip(exchanges, allowances[USDC_ADDRESS]):
+        if allowance is None:
+            print(f"{name}: Error - call failed")
+            continue
+        
+        if allowance == 0:
+            status = "NOT SET"
+        elif allowance > UNLIMITED_ALLOWANCE:
+            status = "UNLIMITED"
+        else:
+            status = f"${format_amount(allowance):,.2f}"
+        
+        icon = "OK" if allowance > 0 else "NEEDS APPROVAL"
+        print(f"{name}:")
+        print(f"  Address: {exchange_addr}")
+        print(f"  Allowance: {status} [{icon}]")
+        print()
     
-    # Also check USDC.e allowances
-    time.sleep(0.5)  # Pause before checking USDC.e
+    # Also show USDC.e allowances
     print(f"{'='*60}")
     print("USDC.e (Native) Allowances")
     print(f"{'='*60}\n")
     
-    usdc_e_contract = w3.eth.contract(address=Web3.to_checksum_address(USDC_E_ADDRESS), abi=ERC20_ABI)
-    
-    for name, exchange_addr in exchanges:
-        try:
-            allowance = usdc_e_contract.functions.allowance(wallet, Web3.to_checksum_address(exchange_addr)).call()
-            formatted = format_amount(allowance)
-            
-            if allowance == 0:
-                status = "NOT SET"
-            elif formatted > 1000000000:
-                status = "UNLIMITED"
-            else:
-                status = f"${formatted:,.2f}"
-            
-            icon = "OK" if allowance > 0 else "NEEDS APPROVAL"
-            print(f"{name}: {status} [{icon}]")
-            time.sleep(0.5)  # Pause to avoid rate limits
-        except Exception as e:
-            print(f"{name}: Error - {e}")
-            time.sleep(0.5)
-    
-    # Prepare contracts for allowance check
-    try:
-        usdc_bridged = w3.eth.contract(address=Web3.to_checksum_address(USDC_ADDRESS), abi=ERC20_ABI)
-    except:
-        usdc_bridged = None
+    for (name, exchange_addr), allowance in zip(exchanges, allowances[USDC_E_ADDRESS]):
+        if allowance is None:
+            print(f"{name}: Error - call failed")
+            continue
+        
+        if allowance == 0:
+            status = "NOT SET"
+        elif allowance > UNLIMITED_ALLOWANCE:
+            status = "UNLIMITED"
+        else:
+            status = f"${format_amount(allowance):,.2f}"
+        
+        icon = "OK" if allowance > 0 else "NEEDS APPROVAL"
+        print(f"{name}: {status} [{icon}]")
     
     print(f"\n{'='*60}")
     print("DIAGNOSIS")
@@ -299,13 +310,14 @@ Current balance: ${bridged_balance:.2f}
 Deposit USDC to your wallet on Polygon network.
 """)
     
-    # Check allowances
-    neg_risk_allowance = 0
-    if usdc_bridged:
-        try:
-            neg_risk_allowance = usdc_bridged.functions.allowance(wallet, Web3.to_checksum_address(NEG_RISK_CTF_EXCHANGE)).call()
-        except:
-            pass
+    if cached_count:
+        print(f"[INFO] {cached_count} allowance value(s) reused from cache (<{rpc_cache.ALLOWANCE_TTL}s old)")
+    if stale_count:
+        print(f"[WARNING] {stale_count} allowance read(s) failed - showing last cached value(s), may be stale")
+    
+    # NegRisk CTF Exchange allowance (already fetched in the batch above)
+    neg_risk_index = [addr for _, addr in exchanges].index(NEG_RISK_CTF_EXCHANGE_CS)
+    neg_risk_allowance = allowances[USDC_ADDRESS][neg_risk_index] or 0
     
     if neg_risk_allowance == 0:
         print("""
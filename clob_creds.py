@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+On-disk cache for derived CLOB API credentials.
+create_or_derive_api_creds() costs an EIP-712 signature plus an API
+round-trip; the result is stable per wallet, so it is derived once and
+reused. Delete .clob_creds.json to force a fresh derive; callers do the
+same per wallet with refresh_api_creds() when the API rejects them (401).
+"""
+
+import os
+import json
+
+from py_clob_client.clob_types import ApiCreds
+
+CREDS_FILE = os.path.join(os.path.dirname(__file__), ".clob_creds.json")
+
+
+def _cache_key(client, signature_type: int) -> str:
+    return f"{client.get_address().lower()}:{signature_type}"
+
+
+def _load() -> dict:
+    try:
+        with open(CREDS_FILE) as f:
+            return json.load(f)
+    except Exception:
+        return {}
+
+
+def _save(cache: dict):
+    try:
+        tmp_path = f"{CREDS_FILE}.{os.getpid()}.tmp"
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'w') as f:
+            json.dump(cache, f)
+        os.replace(tmp_path, CREDS_FILE)
+    except Exception:
+        pass  # Cache is best-effort
+
+
+def get_api_creds(client, signature_type: int = 0) -> ApiCreds:
+    """Return API creds for client's wallet, deriving and caching them on first use."""
+    key = _cache_key(client, signature_type)
+    cache = _load()
+
+    cached = cache.get(key)
+    if cached:
+        return ApiCreds(**cached)
+
+    creds = client.create_or_derive_api_creds()
+    cache[key] = {
+        "api_key": creds.api_key,
+        "api_secret": creds.api_secret,
+        "api_passphrase": creds.api_passphrase,
+    }
+    _save(cache)
+    return creds
+
+
+def invalidate(client, signature_type: int = 0):
+    """Drop the cached creds for client's wallet so the next get_api_creds() re-derives."""
+    cache = _load()
+    if cache.pop(_cache_key(client, signature_type), None) is not None:
+        _save(cache)
+
+
+def is_auth_error(e: Exception) -> bool:
+    """True if e is the CLOB API rejecting the creds (HTTP 401)."""
+    return getattr(e, "status_code", None) == 401
+
+
+def refresh_api_creds(client, signature_type: int = 0) -> ApiCreds:
+    """Replace client's cached creds with freshly derived ones and install them."""
+    invalidate(client, signature_type)
+    creds = get_api_creds(client, signature_type)
+    client.set_api_creds(creds)
+    return creds
@@ -7,6 +7,8 @@ Main menu for all trading tools.
 
 import os
 import sys
+import atexit
+from contextlib import contextmanager
 
 class Colors:
     RESET = "\033[0m"
@@ -32,8 +34,14 @@ MENU_ITEMS = [
     ("6", "Set Allowances", "set_allowances"),
 ]
 
+# Enable ANSI/VT escape processing in the Windows 10+ console
+if os.name == "nt":
+    os.system("")
+
 def clear_screen():
-    os.system("clear" if os.name != "nt" else "cls")
+    """Clear the terminal with an escape sequence (no clear/cls subprocess)."""
+    sys.stdout.write("\x1bc" if os.name != "nt" else "\x1b[2J\x1b[H")
+    sys.stdout.flush()
 
 def show_menu():
     clear_screen()
@@ -48,21 +56,41 @@ def show_menu():
     print(f"\n{Colors.BOLD}{'='*50}{Colors.RESET}")
     print(f"\n{Colors.DIM}Select option:{Colors.RESET} ", end="", flush=True)
 
-def get_single_key():
-    """Get single keypress without Enter."""
+_original_tty = None  # Terminal settings captured once at startup, restored at exit
+
+def _save_terminal():
+    """Capture the cooked-mode terminal settings and restore them on exit."""
+    global _original_tty
     try:
         import termios
-        import tty
         fd = sys.stdin.fileno()
-        old_settings = termios.tcgetattr(fd)
-        try:
-            tty.setraw(fd)
-            ch = sys.stdin.read(1)
-            return ch.lower()
-        finally:
-            termios.tcsetattr(fd, termios.TCSADRAIN, old_settings)
-    except:
+        _original_tty = termios.tcgetattr(fd)
+        atexit.register(termios.tcsetattr, fd, termios.TCSADRAIN, _original_tty)
+    except Exception:
+        _original_tty = None
+
+@contextmanager
+def _raw_mode(stream):
+    """Put the terminal in raw mode for the duration of the block."""
+    import termios
+    import tty
+    fd = stream.fileno()
+    tty.setraw(fd)
+    try:
+        yield
+    finally:
+        termios.tcsetattr(fd, termios.TCSADRAIN, _original_tty)
+
+def get_single_key():
+    """Get single keypress without Enter."""
+    if _original_tty is None:
         return input().strip().lower()
+    
+    with _raw_mode(sys.stdin):
+        ch = sys.stdin.read(1)
+    if ch == "\x03":  # Ctrl-C arrives as a byte in raw mode
+        raise KeyboardInterrupt
+    return ch.lower()
 
 def run_utility_script(module_name, display_name):
     """Run a utility script and show post-action menu."""
@@ -127,6 +155,8 @@ def show_post_action_menu():
         return "menu"
 
 def main():
+    _save_terminal()
+    
     while True:
         show_menu()
         key = get_single_key()
@@ -150,4 +180,7 @@ def main():
                 break
 
 if __name__ == "__main__":
-    main()
+    try:
+        main()
+    except KeyboardInterrupt:
+        print(f"\n{Colors.DIM}Goodbye!{Colors.RESET}\n")
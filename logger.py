@@ -6,30 +6,41 @@ Features:
 - File-only logging (no terminal output)
 - Separate log files per process (trade, redeem, redeemall, balances)
 - 3-hour file rotation
-- Thread-safe message queue for terminal display
+- Non-blocking file writes (QueueHandler -> background QueueListener)
+- Lock-free message queue for terminal display (atomic deque ops)
 - Telegram notifications with rate limiting
 """
 
 import os
 import time
+import atexit
 import logging
-import requests
-from datetime import datetime
-from logging.handlers import TimedRotatingFileHandler
+import queue
+from datetime import datetime, timedelta
+from logging.handlers import TimedRotatingFileHandler, QueueHandler, QueueListener
 from collections import deque
-from threading import Lock, Thread
+from threading import Thread
 from queue import Queue, Empty
 
+try:
+    import orjson  # Optional: faster JSON encoding for Telegram payloads
+except ImportError:
+    orjson = None
+
 LOGS_DIR = os.path.join(os.path.dirname(__file__), "logs")
 os.makedirs(LOGS_DIR, exist_ok=True)
 
 _loggers = {}
+_listeners = {}
+# Bounded deque: append/clear/list() are each atomic under the GIL, so no lock needed
 _message_queue = deque(maxlen=10)
-_message_lock = Lock()
 _telegram_notifier = None
 
 QUIET_MODE = True
 
+# File log level; DEBUG by default, LOG_LEVEL=INFO drops per-message WebSocket debug lines
+LOG_LEVEL = getattr(logging, os.getenv("LOG_LEVEL", "DEBUG").upper(), logging.DEBUG)
+
 TELEGRAM_BOT_TOKEN = os.getenv("TELEGRAM_BOT_TOKEN", "")
 TELEGRAM_CHAT_ID = os.getenv("TELEGRAM_CHAT_ID", "")
 
@@ -41,8 +52,10 @@ class TelegramNotifier:
     Features:
     - Background thread for sending
     - Rate limiting (5 msg/sec max)
+    - Bursts batched into a single message (up to 10 msgs / 3500 chars)
     - Graceful error handling (never crashes main process)
     - Drop counter for monitoring queue overflow
+    - Keep-alive HTTP session (one TLS handshake, reused across sends)
     """
     
     LEVEL_ICONS = {
@@ -53,6 +66,9 @@ class TelegramNotifier:
         "info": "INFO"
     }
     
+    BATCH_MAX_MESSAGES = 10
+    BATCH_MAX_CHARS = 3500
+    
     def __init__(self, bot_token: str, chat_id: str, rate_limit: float = 5.0):
         self.bot_token = bot_token
         self.chat_id = chat_id
@@ -64,8 +80,15 @@ class TelegramNotifier:
         self.enabled = bool(bot_token and chat_id)
         self.dropped_count = 0
         self.last_drop_warning = 0.0
+        self.session = None
         
         if self.enabled:
+            # Imported here so scripts that only log to file never pay for requests
+            import requests
+            from requests.adapters import HTTPAdapter
+            self.session = requests.Session()
+            self.session.mount('https://', HTTPAdapter(pool_connections=1, pool_maxsize=2))
+            
             self.thread = Thread(target=self._worker, daemon=True)
             self.thread.start()
     
@@ -77,28 +100,52 @@ class TelegramNotifier:
                 if msg is None:
                     continue
                 
-                now = time.time()
-                elapsed = now - self.last_send_time
-                if elapsed < self.min_interval:
-                    time.sleep(self.min_interval - elapsed)
+                # Drain a burst into one sendMessage (Telegram caps text at 4096 chars)
+                batch = [msg]
+                length = len(msg)
+                while len(batch) < self.BATCH_MAX_MESSAGES:
+                    try:
+                        nxt = self.queue.get_nowait()
+                    except Empty:
+                        break
+                    if nxt is None:
+                        continue
+                    if length + len(nxt) + 2 > self.BATCH_MAX_CHARS:
+                        self._send_paced("\n\n".join(batch))
+                        batch, length = [], 0
+                    batch.append(nxt)
+                    length += len(nxt) + 2
                 
-                self._send(msg)
-                self.last_send_time = time.time()
+                self._send_paced("\n\n".join(batch))
                 
             except Empty:
                 continue
             except Exception:
                 pass
     
+    def _send_paced(self, message: str):
+        """Send message, sleeping first if needed to respect the rate limit."""
+        elapsed = time.time() - self.last_send_time
+        if elapsed < self.min_interval:
+            time.sleep(self.min_interval - elapsed)
+        
+        self._send(message)
+        self.last_send_time = time.time()
+    
     def _send(self, message: str):
         """Send message to Telegram (with timeout)."""
         try:
             url = f"https://api.telegram.org/bot{self.bot_token}/sendMessage"
-            requests.post(url, json={
+            payload = {
                 "chat_id": self.chat_id,
                 "text": message,
                 "parse_mode": "HTML"
-            }, timeout=2.0)
+            }
+            if orjson is not None:
+                self.session.post(url, data=orjson.dumps(payload),
+                                  headers={"Content-Type": "application/json"}, timeout=2.0)
+            else:
+                self.session.post(url, json=payload, timeout=2.0)
         except Exception:
             pass
     
@@ -127,6 +174,11 @@ class TelegramNotifier:
     def stop(self):
         """Stop the notifier."""
         self.running = False
+        if self.session is not None:
+            try:
+                self.session.close()
+            except Exception:
+                pass
 
 
 def get_telegram_notifier() -> TelegramNotifier:
@@ -140,8 +192,15 @@ def get_telegram_notifier() -> TelegramNotifier:
     return _telegram_notifier
 
 
+def next_3h_boundary_epoch(t: float) -> float:
+    """Epoch of the next local 3-hour block start (00h, 03h, 06h, ...) after t."""
+    now = datetime.fromtimestamp(t)
+    block_start = now.replace(hour=(now.hour // 3) * 3, minute=0, second=0, microsecond=0)
+    return (block_start + timedelta(hours=3)).timestamp()
+
+
 class ThreeHourRotatingHandler(TimedRotatingFileHandler):
-    """Rotate logs every 3 hours."""
+    """Rotate logs every 3 hours (aligned to 3-hour blocks of the day)."""
     
     def __init__(self, process_name):
         self.process_name = process_name
@@ -153,6 +212,7 @@ class ThreeHourRotatingHandler(TimedRotatingFileHandler):
             backupCount=24,
             encoding='utf-8'
         )
+        self._rollover_at = next_3h_boundary_epoch(time.time())
     
     def _get_current_filename(self):
         now = datetime.now()
@@ -160,6 +220,10 @@ class ThreeHourRotatingHandler(TimedRotatingFileHandler):
         timestamp = now.strftime(f"%Y-%m-%d_{hour_block:02d}h")
         return os.path.join(LOGS_DIR, f"{self.process_name}_{timestamp}.log")
     
+    def shouldRollover(self, record):
+        # Plain float compare per record - filename is only built on rollover
+        return record.created >= self._rollover_at
+    
     def doRollover(self):
         if self.stream:
             self.stream.close()
@@ -167,6 +231,23 @@ class ThreeHourRotatingHandler(TimedRotatingFileHandler):
         
         self.baseFilename = self._get_current_filename()
         self.stream = self._open()
+        self._rollover_at = next_3h_boundary_epoch(time.time())
+
+
+class CachedTimeFormatter(logging.Formatter):
+    """Formatter that reuses the formatted timestamp for records in the same second."""
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._time_cache = (None, "")
+    
+    def formatTime(self, record, datefmt=None):
+        second = int(record.created)
+        cached_second, cached_str = self._time_cache
+        if second != cached_second:
+            cached_str = super().formatTime(record, datefmt)
+            self._time_cache = (second, cached_str)
+        return cached_str
 
 
 def get_logger(process_name: str) -> logging.Logger:
@@ -175,16 +256,24 @@ def get_logger(process_name: str) -> logging.Logger:
         return _loggers[process_name]
     
     logger = logging.getLogger(f"polymarket.{process_name}")
-    logger.setLevel(logging.DEBUG)
+    logger.setLevel(LOG_LEVEL)
     logger.handlers.clear()
     
     handler = ThreeHourRotatingHandler(process_name)
-    handler.setLevel(logging.DEBUG)
-    handler.setFormatter(logging.Formatter(
+    handler.setLevel(LOG_LEVEL)
+    handler.setFormatter(CachedTimeFormatter(
         '%(asctime)s [%(levelname)s] %(message)s',
         datefmt='%Y-%m-%d %H:%M:%S'
     ))
-    logger.addHandler(handler)
+    
+    # Callers only enqueue; the file handler runs on the listener's own thread
+    log_queue = queue.SimpleQueue()
+    listener = QueueListener(log_queue, handler, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)  # Flushes queued records on exit
+    _listeners[process_name] = listener
+    
+    logger.addHandler(QueueHandler(log_queue))
     
     logger.propagate = False
     
@@ -237,8 +326,7 @@ class TerminalMessage:
 
 def add_message(text: str, level: str = "info"):
     """Add a message to the terminal queue and send to Telegram."""
-    with _message_lock:
-        _message_queue.append(TerminalMessage(text, level))
+    _message_queue.append(TerminalMessage(text, level))
     
     try:
         notifier = get_telegram_notifier()
@@ -249,14 +337,12 @@ def add_message(text: str, level: str = "info"):
 
 def get_messages() -> list:
     """Get all messages in the queue for display."""
-    with _message_lock:
-        return list(_message_queue)
+    return list(_message_queue)
 
 
 def clear_messages():
     """Clear all messages."""
-    with _message_lock:
-        _message_queue.clear()
+    _message_queue.clear()
 
 
 def format_messages_block(max_lines: int = 10) -> str:
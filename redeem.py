@@ -12,30 +12,83 @@ import os
 import sys
 import time
 import json
+import random
+import logging
+import threading
+from functools import lru_cache
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from datetime import datetime
 from dotenv import load_dotenv
+from eth_abi import encode as abi_encode
 from web3 import Web3
+from web3.exceptions import TransactionNotFound, TimeExhausted
 from eth_account import Account
 
+try:
+    import orjson  # Optional: faster parsing of Gamma API responses
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
 load_dotenv()
 
 from logger import get_logger, Colors
 from redeem_lock import RedeemLock
+from rpc import encode_call, batch_read, make_web3, checksum, selector
 
 logger = get_logger("redeem")
 
 _silent_context = {"silent": False}
 
+# Resolved oracle results: condition_id -> (winning_outcome, payout_denominator, insert_ts)
+_ORACLE_CACHE = {}
+ORACLE_CACHE_TTL = 3600  # seconds
+ORACLE_CACHE_MAX = 1024
+
+REDEEM_DEADLINE = 600  # seconds - overall budget for redeem_specific retries
+
+WS_HEAD_WAIT = 3  # seconds - longest wait for a newHeads message before re-checking the receipt
+
+# Shared Web3 connection + wallet, created on first use (see _get_w3)
+_W3 = None
+_WALLET = None
+_w3_lock = threading.Lock()
+
 PRIVATE_KEY = os.getenv("PRIVATE_KEY", "")
 RPC_URL = os.getenv("RPC_URL", "https://polygon-rpc.com")
+WSS_URL = os.getenv("WSS_URL", "")  # Optional: websocket RPC for instant receipt detection
 GAMMA_API = "https://gamma-api.polymarket.com"
 
+# Keep-alive session for Gamma API calls (reuses the TLS connection across lookups)
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=8,
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[502, 503, 504]),
+))
+
 USDC_ADDRESS = "0x2791Bca1f2de4661ED88A30C99A7a9449Aa84174"
 CTF_ADDRESS = "0x4D97DCd97eC945f40cF65F87097ACe5EA0476045"
 NEG_RISK_ADAPTER = "0xd91E80cF2E7be2e162c6513ceD06f1dD0dA35296"
 
-CTF_ABI = json.loads('''[
+# EIP-1559 tip - Polygon validators ignore tips below ~25-30 gwei
+PRIORITY_FEE = Web3.to_wei(30, 'gwei')
+REPLACEMENT_FEE_BUMP = 1.125  # Nodes need both fees raised >= 10% to replace a pending TX
+
+USDC_ADDRESS_CS = checksum(USDC_ADDRESS)
+CTF_ADDRESS_CS = checksum(CTF_ADDRESS)
+NEG_RISK_ADAPTER_CS = checksum(NEG_RISK_ADAPTER)
+
+# Oracle read selectors - calldata is just selector + bytes32 (+ uint256 index)
+SEL_PAYOUT_DENOMINATOR = selector("payoutDenominator(bytes32)")
+SEL_PAYOUT_NUMERATORS = selector("payoutNumerators(bytes32,uint256)")
+
+SEL_REDEEM_NEG_RISK = selector("redeemPositions(bytes32,uint256[])")
+SEL_REDEEM_CTF = selector("redeemPositions(address,bytes32,bytes32,uint256[])")
+
+CTF_ABI = [
     {
         "inputs": [
             {"internalType": "address", "name": "account", "type": "address"},
@@ -77,20 +130,175 @@ CTF_ABI = json.loads('''[
         "stateMutability": "nonpayable",
         "type": "function"
     }
-]''')
+]
 
-NEG_RISK_ABI = json.loads('''[
-    {
-        "inputs": [
-            {"internalType": "bytes32", "name": "conditionId", "type": "bytes32"},
-            {"internalType": "uint256[]", "name": "amounts", "type": "uint256[]"}
-        ],
-        "name": "redeemPositions",
-        "outputs": [],
-        "stateMutability": "nonpayable",
-        "type": "function"
+
+@lru_cache(maxsize=4)
+def _ctf(w3):
+    """CTF contract bound to w3 (built once per Web3 instance)."""
+    return w3.eth.contract(address=CTF_ADDRESS_CS, abi=CTF_ABI)
+
+
+GAS_BUFFER = 1.2  # Headroom over eth_estimateGas
+
+
+def estimate_gas_limit(w3, tx_base):
+    """Estimate gas for a prepared tx (from/to/data/value), plus a 20% buffer.
+    
+    Raises if the call would revert (e.g. already redeemed), before any gas is spent.
+    """
+    estimate = w3.eth.estimate_gas({k: tx_base[k] for k in ("from", "to", "data", "value")})
+    return int(estimate * GAS_BUFFER)
+
+
+def build_redeem_tx(wallet, condition_bytes, neg_risk, up_balance, down_balance):
+    """Build the static part of a redeemPositions tx (everything but nonce/gas/fees).
+    
+    Calldata is selector + eth_abi encoding, skipping Contract.functions and
+    build_transaction (which would also issue its own RPC calls).
+    """
+    if neg_risk:
+        # NegRisk Adapter: redeemPositions(conditionId, amounts)
+        to = NEG_RISK_ADAPTER_CS
+        data = SEL_REDEEM_NEG_RISK + abi_encode(
+            ["bytes32", "uint256[]"],
+            [condition_bytes, [up_balance, down_balance]]
+        )
+    else:
+        # CTF: redeemPositions(collateral, parentCollectionId, conditionId, indexSets)
+        to = CTF_ADDRESS_CS
+        data = SEL_REDEEM_CTF + abi_encode(
+            ["address", "bytes32", "bytes32", "uint256[]"],
+            [USDC_ADDRESS_CS, bytes(32), condition_bytes, [1, 2]]
+        )
+    
+    return {
+        "chainId": 137,
+        "from": wallet,
+        "to": to,
+        "data": Web3.to_hex(data),
+        "value": 0,
+        "type": 2,
     }
-]''')
+
+
+def get_nonce_and_fees(w3, wallet):
+    """Get (nonce, maxPriorityFeePerGas, maxFeePerGas) in one JSON-RPC batch.
+    
+    The nonce counts pending transactions, so a tx broadcast by another
+    process (but not yet mined) is not reused. A retry of our own still
+    pending redeem must not take this nonce - it replaces that TX at its
+    nonce instead (see redeem_specific).
+    Fees come from the pending block's base fee: maxFeePerGas = 2 * baseFee + tip,
+    so the tx stays valid across several blocks of base-fee growth; only
+    baseFee + tip is actually paid. Falls back to sequential calls if the RPC
+    rejects batch requests.
+    """
+    try:
+        with w3.batch_requests() as batch:
+            batch.add(w3.eth.get_transaction_count(wallet, "pending"))
+            batch.add(w3.eth.get_block("pending"))
+            nonce, block = batch.execute()
+    except Exception as e:
+        logger.debug("JSON-RPC batch failed (%s), fetching nonce/block sequentially", e)
+        nonce = w3.eth.get_transaction_count(wallet, "pending")
+        block = w3.eth.get_block("pending")
+    
+    base_fee = block["baseFeePerGas"]
+    return nonce, PRIORITY_FEE, base_fee * 2 + PRIORITY_FEE
+
+
+def find_mined_receipt(w3, wallet, nonce, tx_hashes):
+    """Check whether a TX sent at nonce has been mined.
+    
+    The latest (mined) nonce is read first, so a TX that lands between the
+    two reads can't be mistaken for a dropped one.
+    
+    Returns:
+        (mined, receipt): mined is False while nonce is still unused on-chain.
+        Once it is used, receipt belongs to whichever of tx_hashes took it,
+        or is None if some other TX from wallet did.
+    """
+    if w3.eth.get_transaction_count(wallet) <= nonce:
+        return False, None
+    for tx_hash in tx_hashes:
+        try:
+            return True, w3.eth.get_transaction_receipt(tx_hash)
+        except TransactionNotFound:
+            continue
+    return True, None
+
+
+def _get_w3():
+    """Get the shared (w3, wallet), connecting on first use.
+    
+    Only the first call pays for is_connected() and the key derivation;
+    later calls reuse both. Returns (None, None) if the RPC is unreachable.
+    """
+    global _W3, _WALLET
+    if _W3 is None:
+        with _w3_lock:
+            if _W3 is None:
+                w3 = make_web3(RPC_URL)
+                if not w3.is_connected():
+                    return None, None
+                _WALLET = Account.from_key(PRIVATE_KEY).address
+                _W3 = w3
+    return _W3, _WALLET
+
+
+def wait_for_receipt(w3, tx_hash, timeout=180):
+    """Wait for a transaction receipt.
+    
+    With WSS_URL set, subscribes to newHeads and checks for the receipt as
+    each block lands, instead of HTTP-polling on a fixed interval. Each wait
+    for a head is capped at WS_HEAD_WAIT, so a feed that stalls still gets a
+    receipt check about once a block. Falls back to
+    w3.eth.wait_for_transaction_receipt if the websocket fails or the node
+    rejects the subscription.
+    """
+    if not WSS_URL:
+        return w3.eth.wait_for_transaction_receipt(tx_hash, timeout=timeout)
+    
+    import websocket
+    
+    deadline = time.monotonic() + timeout
+    ws = None
+    try:
+        ws = websocket.create_connection(WSS_URL, timeout=min(timeout, 10))
+        ws.send(json.dumps({"jsonrpc": "2.0", "id": 1, "method": "eth_subscribe", "params": ["newHeads"]}))
+        reply = _json_loads(ws.recv())
+        if reply.get("error") or not reply.get("result"):
+            raise ValueError(f"eth_subscribe rejected: {reply.get('error')}")
+        
+        while True:
+            try:
+                return w3.eth.get_transaction_receipt(tx_hash)
+            except TransactionNotFound:
+                pass
+            
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeExhausted(f"Transaction {tx_hash.hex()} not mined after {timeout}s")
+            ws.settimeout(min(remaining, WS_HEAD_WAIT))
+            try:
+                ws.recv()  # Next block head
+            except websocket.WebSocketTimeoutException:
+                pass  # No head this interval - check the receipt anyway
+            
+    except TimeExhausted:
+        raise
+    except Exception as e:
+        logger.warning(f"newHeads subscription failed ({e}), polling for receipt over HTTP")
+        remaining = max(deadline - time.monotonic(), 1)
+        return w3.eth.wait_for_transaction_receipt(tx_hash, timeout=remaining)
+    finally:
+        if ws is not None:
+            try:
+                ws.close()
+            except Exception:
+                pass
+
 
 def print_status(message, status="info"):
     """Print status message (respects silent mode via context dict)."""
@@ -111,26 +319,26 @@ def print_status(message, status="info"):
 
 def get_market_info(slug):
     """Get market info from Gamma API."""
-    logger.debug(f"Fetching market info for: {slug}")
+    logger.debug("Fetching market info for: %s", slug)
     try:
         url = f"{GAMMA_API}/events?slug={slug}"
-        logger.debug(f"API URL: {url}")
-        response = requests.get(url, timeout=10)
-        logger.debug(f"API response status: {response.status_code}")
+        logger.debug("API URL: %s", url)
+        response = _SESSION.get(url, timeout=10)
+        logger.debug("API response status: %s", response.status_code)
         
         if response.status_code != 200:
             logger.error(f"API returned non-200 status: {response.status_code}")
             return None
         
-        events = response.json()
-        logger.debug(f"API returned {len(events)} events")
+        events = _json_loads(response.content)
+        logger.debug("API returned %s events", len(events))
         
         if not events:
             logger.warning("No events found")
             return None
         
         event = events[0]
-        logger.debug(f"Event closed: {event.get('closed')}, active: {event.get('active')}")
+        logger.debug("Event closed: %s, active: %s", event.get('closed'), event.get('active'))
         markets = event.get("markets", [])
         
         for market in markets:
@@ -139,15 +347,16 @@ def get_market_info(slug):
             outcomes = market.get("outcomes", [])
             
             if isinstance(clob_token_ids, str):
-                clob_token_ids = json.loads(clob_token_ids)
+                clob_token_ids = _json_loads(clob_token_ids)
             if isinstance(outcomes, str):
-                outcomes = json.loads(outcomes)
+                outcomes = _json_loads(outcomes)
             
             if not condition_id or len(clob_token_ids) < 2:
                 continue
             
-            up_index = outcomes.index("Up") if "Up" in outcomes else 0
-            down_index = outcomes.index("Down") if "Down" in outcomes else 1
+            outcome_idx = {outcome: i for i, outcome in enumerate(outcomes)}
+            up_index = outcome_idx.get("Up", 0)
+            down_index = outcome_idx.get("Down", 1)
             
             return {
                 "slug": slug,
@@ -173,55 +382,140 @@ def get_token_balance(w3, ctf, wallet, token_id):
         return 0
 
 
+def _oracle_calls(condition_bytes):
+    """payoutDenominator + both payoutNumerators as call tuples.
+    
+    Calldata is concatenated by hand (static args only) instead of going
+    through eth_abi / Contract.functions.
+    """
+    uint256 = ["uint256"]
+    return [
+        (CTF_ADDRESS_CS, SEL_PAYOUT_DENOMINATOR + condition_bytes, uint256),
+        (CTF_ADDRESS_CS, SEL_PAYOUT_NUMERATORS + condition_bytes + (0).to_bytes(32, "big"), uint256),
+        (CTF_ADDRESS_CS, SEL_PAYOUT_NUMERATORS + condition_bytes + (1).to_bytes(32, "big"), uint256),
+    ]
+
+
+def _parse_oracle(condition_id, payout_denom, up_payout, down_payout):
+    """Turn raw payout reads into (is_resolved, winning_outcome, payout_denominator)."""
+    logger.debug("Oracle check - condition: %s..., payoutDenominator: %s", condition_id[:20], payout_denom)
+    
+    if not payout_denom:
+        return False, None, 0
+    
+    logger.debug("Payout numerators - UP: %s, DOWN: %s", up_payout, down_payout)
+    
+    # Check which outcome won (0=UP, 1=DOWN)
+    winning = None
+    if up_payout:
+        winning = 0  # UP won
+    elif down_payout:
+        winning = 1  # DOWN won
+    
+    return True, winning, payout_denom
+
+
+def _cached_oracle(condition_id):
+    """Get a cached (True, winning_outcome, payout_denominator), or None on miss/expiry."""
+    entry = _ORACLE_CACHE.get(condition_id)
+    if entry and time.time() - entry[2] < ORACLE_CACHE_TTL:
+        logger.debug("Oracle cache hit - condition: %s...", condition_id[:20])
+        return True, entry[0], entry[1]
+    return None
+
+
+def _remember_oracle(condition_id, oracle):
+    """Cache a resolved oracle result (resolution is final on-chain)."""
+    is_resolved, winning, payout_denom = oracle
+    if not is_resolved:
+        return
+    
+    now = time.time()
+    if len(_ORACLE_CACHE) >= ORACLE_CACHE_MAX:
+        for key in [k for k, v in _ORACLE_CACHE.items() if now - v[2] >= ORACLE_CACHE_TTL]:
+            del _ORACLE_CACHE[key]
+        if len(_ORACLE_CACHE) >= ORACLE_CACHE_MAX:
+            del _ORACLE_CACHE[min(_ORACLE_CACHE, key=lambda k: _ORACLE_CACHE[k][2])]
+    _ORACLE_CACHE[condition_id] = (winning, payout_denom, now)
+
+
 def check_oracle_resolution(w3, ctf, condition_id):
     """Check if oracle has resolved the market.
     
+    All three payout reads go out in a single Multicall3 call
+    (or concurrently as plain eth_calls if Multicall3 is unavailable).
+    Resolved results are cached in memory, so repeat checks skip the RPC.
+    
     Returns:
         tuple: (is_resolved, winning_outcome, payout_denominator)
         - is_resolved: True if market is resolved
         - winning_outcome: 0 for UP, 1 for DOWN, None if not resolved
         - payout_denominator: The denominator value
     """
+    cached = _cached_oracle(condition_id)
+    if cached:
+        return cached
+    
     try:
         condition_bytes = Web3.to_bytes(hexstr=condition_id)
-        payout_denom = ctf.functions.payoutDenominator(condition_bytes).call()
-        
-        logger.debug(f"Oracle check - condition: {condition_id[:20]}..., payoutDenominator: {payout_denom}")
-        
-        if payout_denom == 0:
-            return False, None, 0
-        
-        # Check which outcome won (0=UP, 1=DOWN)
-        up_payout = ctf.functions.payoutNumerators(condition_bytes, 0).call()
-        down_payout = ctf.functions.payoutNumerators(condition_bytes, 1).call()
-        
-        logger.debug(f"Payout numerators - UP: {up_payout}, DOWN: {down_payout}")
-        
-        winning = None
-        if up_payout > 0:
-            winning = 0  # UP won
-        elif down_payout > 0:
-            winning = 1  # DOWN won
-        
-        return True, winning, payout_denom
+        payout_denom, up_payout, down_payout = batch_read(w3, _oracle_calls(condition_bytes))
+        oracle = _parse_oracle(condition_id, payout_denom, up_payout, down_payout)
+        _remember_oracle(condition_id, oracle)
+        return oracle
         
     except Exception as e:
         logger.error(f"Oracle check error: {e}")
         return False, None, 0
 
 
+def read_redeem_state(w3, ctf, wallet, condition_id, up_token_id, down_token_id):
+    """Read both token balances and the oracle state in one Multicall3 call.
+    
+    Falls back to concurrent eth_calls (rpc.parallel_calls) if Multicall3 fails.
+    The oracle reads are skipped when a resolved result is already cached.
+    
+    Returns:
+        tuple: (up_balance, down_balance, (is_resolved, winning_outcome, payout_denominator))
+        Failed reads count as 0 / unresolved, like get_token_balance and check_oracle_resolution.
+    """
+    try:
+        condition_bytes = Web3.to_bytes(hexstr=condition_id)
+        cached = _cached_oracle(condition_id)
+        calls = [
+            encode_call(ctf, "balanceOf", [wallet, int(up_token_id)]),
+            encode_call(ctf, "balanceOf", [wallet, int(down_token_id)]),
+        ]
+        if not cached:
+            calls += _oracle_calls(condition_bytes)
+        
+        results = batch_read(w3, calls)
+        up_balance, down_balance = results[0], results[1]
+        if cached:
+            oracle = cached
+        else:
+            oracle = _parse_oracle(condition_id, *results[2:])
+            _remember_oracle(condition_id, oracle)
+        return up_balance or 0, down_balance or 0, oracle
+        
+    except Exception as e:
+        logger.error(f"Balance/oracle read error: {e}")
+        return 0, 0, (False, None, 0)
+
+
 def redeem(w3, wallet, private_key, market_info):
     """Redeem position for a market."""
     logger.info(f"Starting redeem for market: {market_info.get('slug', 'unknown')}")
-    logger.debug(f"Condition ID: {market_info.get('condition_id', 'N/A')}")
-    logger.debug(f"UP token: {market_info.get('up_token_id', 'N/A')}")
-    logger.debug(f"DOWN token: {market_info.get('down_token_id', 'N/A')}")
-    logger.debug(f"Market closed: {market_info.get('closed', False)}")
+    logger.debug("Condition ID: %s", market_info.get('condition_id', 'N/A'))
+    logger.debug("UP token: %s", market_info.get('up_token_id', 'N/A'))
+    logger.debug("DOWN token: %s", market_info.get('down_token_id', 'N/A'))
+    logger.debug("Market closed: %s", market_info.get('closed', False))
     
-    ctf = w3.eth.contract(address=Web3.to_checksum_address(CTF_ADDRESS), abi=CTF_ABI)
+    ctf = _ctf(w3)
     
-    up_balance = get_token_balance(w3, ctf, wallet, market_info["up_token_id"])
-    down_balance = get_token_balance(w3, ctf, wallet, market_info["down_token_id"])
+    condition_id = market_info["condition_id"]
+    up_balance, down_balance, oracle = read_redeem_state(
+        w3, ctf, wallet, condition_id, market_info["up_token_id"], market_info["down_token_id"]
+    )
     
     logger.info(f"Token balances - UP: {up_balance / 1e6:.6f}, DOWN: {down_balance / 1e6:.6f}")
     
@@ -239,9 +533,8 @@ def redeem(w3, wallet, private_key, market_info):
         print("  Wait for oracle to resolve the market (~1-2 min after close)")
         return False
     
-    # Check oracle resolution
-    condition_id = market_info["condition_id"]
-    is_resolved, winning_outcome, payout_denom = check_oracle_resolution(w3, ctf, condition_id)
+    # Oracle resolution (already read in the same batch as the balances)
+    is_resolved, winning_outcome, payout_denom = oracle
     
     if not is_resolved:
         print_status("Oracle has NOT resolved this market yet!", "warn")
@@ -267,52 +560,34 @@ def redeem(w3, wallet, private_key, market_info):
         print_status("Sending redeem transaction...")
         
         condition_id = market_info["condition_id"]
+        condition_bytes = Web3.to_bytes(hexstr=condition_id)
         is_neg_risk = market_info.get("neg_risk", False)
         
-        logger.debug(f"Market type: {'NegRisk' if is_neg_risk else 'Standard CTF'}")
+        logger.debug("Market type: %s", 'NegRisk' if is_neg_risk else 'Standard CTF')
         
-        nonce = w3.eth.get_transaction_count(wallet)
-        gas_price = w3.eth.gas_price
+        nonce, priority_fee, max_fee = get_nonce_and_fees(w3, wallet)
         
-        logger.debug(f"TX params - nonce: {nonce}, gas_price: {gas_price}")
+        logger.debug("TX params - nonce: %s, max_fee: %s, priority_fee: %s", nonce, max_fee, priority_fee)
         
         if is_neg_risk:
-            adapter = w3.eth.contract(
-                address=Web3.to_checksum_address(NEG_RISK_ADAPTER),
-                abi=NEG_RISK_ABI
-            )
-            amounts = [up_balance, down_balance]
-            logger.debug(f"NegRisk redeem - condition: {condition_id}, amounts: {amounts}")
-            
-            tx = adapter.functions.redeemPositions(
-                Web3.to_bytes(hexstr=condition_id),
-                amounts
-            ).build_transaction({
-                "chainId": 137,
-                "from": wallet,
-                "nonce": nonce,
-                "gas": 500000,
-                "gasPrice": int(gas_price * 1.5),
-            })
+            logger.debug("NegRisk redeem - condition: %s, amounts: %s", condition_id, [up_balance, down_balance])
         else:
-            logger.debug(f"Standard CTF redeem - condition: {condition_id}")
-            index_sets = [1, 2]
-            parent_collection_id = bytes(32)
-            
-            tx = ctf.functions.redeemPositions(
-                Web3.to_checksum_address(USDC_ADDRESS),
-                parent_collection_id,
-                Web3.to_bytes(hexstr=condition_id),
-                index_sets
-            ).build_transaction({
-                "chainId": 137,
-                "from": wallet,
-                "nonce": nonce,
-                "gas": 500000,
-                "gasPrice": int(gas_price * 1.5),
-            })
+            logger.debug("Standard CTF redeem - condition: %s", condition_id)
+        
+        tx_base = build_redeem_tx(wallet, condition_bytes, is_neg_risk, up_balance, down_balance)
+        gas_limit = estimate_gas_limit(w3, tx_base)
+        logger.debug("Estimated gas limit (with buffer): %s", gas_limit)
+        
+        tx = {
+            **tx_base,
+            "nonce": nonce,
+            "gas": gas_limit,
+            "maxFeePerGas": max_fee,
+            "maxPriorityFeePerGas": priority_fee,
+        }
         
-        logger.debug(f"Built transaction: {json.dumps({k: str(v) for k, v in tx.items()})}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Built transaction: %s", {k: str(v) for k, v in tx.items()})
         
         signed_tx = w3.eth.account.sign_transaction(tx, private_key=private_key)
         logger.info("Transaction signed, broadcasting...")
@@ -323,8 +598,8 @@ def redeem(w3, wallet, private_key, market_info):
         print(f"  TX: {tx_hash.hex()}")
         print_status("Waiting for confirmation...")
         
-        receipt = w3.eth.wait_for_transaction_receipt(tx_hash, timeout=180)
-        logger.debug(f"TX receipt: status={receipt.get('status')}, gas_used={receipt.get('gasUsed')}")
+        receipt = wait_for_receipt(w3, tx_hash, timeout=180)
+        logger.debug("TX receipt: status=%s, gas_used=%s", receipt.get('status'), receipt.get('gasUsed'))
         
         if receipt.get("status") == 1:
             winning_balance = up_balance if winning_outcome == 0 else down_balance
@@ -332,7 +607,8 @@ def redeem(w3, wallet, private_key, market_info):
             return True
         else:
             print_status("Transaction reverted", "error")
-            logger.error(f"TX reverted - receipt: {dict(receipt)}")
+            logger.error("TX reverted - status=%s gasUsed=%s", receipt.get("status"), receipt.get("gasUsed"))
+            logger.debug("Full receipt: %s", receipt)
             print("  Possible causes:")
             print("  - Market not resolved yet (oracle delay)")
             print("  - Already redeemed")
@@ -373,18 +649,16 @@ def redeem_specific(condition_id, up_token_id=None, down_token_id=None, neg_risk
         print_status("PRIVATE_KEY not set in .env", "error")
         return False
     
-    w3 = Web3(Web3.HTTPProvider(RPC_URL))
-    if not w3.is_connected():
+    w3, wallet = _get_w3()
+    if w3 is None:
         print_status("Cannot connect to Polygon", "error")
         return False
     
-    account = Account.from_key(PRIVATE_KEY)
-    wallet = account.address
-    
-    # Get balances directly using token IDs (no API lookup needed)
-    ctf = w3.eth.contract(address=Web3.to_checksum_address(CTF_ADDRESS), abi=CTF_ABI)
-    up_balance = get_token_balance(w3, ctf, wallet, up_token_id)
-    down_balance = get_token_balance(w3, ctf, wallet, down_token_id)
+    # Get balances directly using token IDs (no API lookup needed), batched with the oracle reads
+    ctf = _ctf(w3)
+    up_balance, down_balance, oracle = read_redeem_state(
+        w3, ctf, wallet, condition_id, up_token_id, down_token_id
+    )
     
     logger.info(f"Token balances - UP: {up_balance / 1e6:.2f}, DOWN: {down_balance / 1e6:.2f}")
     if not _silent_context.get("silent"):
@@ -396,8 +670,8 @@ def redeem_specific(condition_id, up_token_id=None, down_token_id=None, neg_risk
         print_status("No tokens to redeem", "warn")
         return False
     
-    # Check oracle resolution (skip closed check - we know market ended)
-    is_resolved, winning_outcome, payout_denom = check_oracle_resolution(w3, ctf, condition_id)
+    # Oracle resolution (skip closed check - we know market ended)
+    is_resolved, winning_outcome, payout_denom = oracle
     logger.info(f"Oracle check: resolved={is_resolved}, outcome={winning_outcome}, denominator={payout_denom}")
     if not is_resolved:
         print_status("Oracle has not resolved yet (payoutDenominator=0)", "warn")
@@ -416,103 +690,125 @@ def redeem_specific(condition_id, up_token_id=None, down_token_id=None, neg_risk
             print_status("Cancelled", "warn")
             return False
     
-    # Acquire lock to prevent concurrent redemptions
+    condition_bytes = Web3.to_bytes(hexstr=condition_id)
+    
+    max_attempts = 5
+    base_delay = 0.5
+    deadline = time.monotonic() + REDEEM_DEADLINE
+    
+    # Encode calldata once - retries only change nonce and fees
+    if neg_risk:
+        # NegRisk markets use NegRisk Adapter
+        logger.debug("NegRisk redeem - condition: %s..., amounts: %s", condition_id[:20], [up_balance, down_balance])
+    else:
+        # Standard CTF markets use CTF Exchange directly
+        logger.debug("Standard CTF redeem - condition: %s...", condition_id[:20])
+    
+    tx_base = build_redeem_tx(wallet, condition_bytes, neg_risk, up_balance, down_balance)
+    gas_limit = None
+    
+    # The lock only covers nonce fetch + broadcast (see below), not the receipt wait
     lock = RedeemLock(timeout=120.0)
-    if not lock.acquire():
-        print_status("Another redeem in progress, try later", "warn")
-        return False
     
-    try:
-        max_attempts = 3
-        retry_delay = 10
-        
-        for attempt in range(1, max_attempts + 1):
+    # Redeem broadcast but not yet seen mined: its nonce, last fees and every
+    # hash sent at that nonce. Retries replace it rather than send a duplicate.
+    in_flight = None
+    
+    for attempt in range(1, max_attempts + 1):
+        try:
+            if attempt > 1:
+                logger.info(f"Retry {attempt-1}/{max_attempts-1} for redeem...")
+                if not _silent_context.get("silent"):
+                    print_status(f"Retry {attempt-1}/{max_attempts-1}...", "warn")
+            else:
+                print_status("Sending redeem transaction...")
+            
+            if in_flight is not None:
+                # The last attempt's TX may have been mined after its wait gave up
+                mined, receipt = find_mined_receipt(w3, wallet, in_flight["nonce"], in_flight["hashes"])
+                if mined:
+                    in_flight = None
+                    if receipt is not None:
+                        if receipt.status != 1:
+                            raise Exception("Transaction reverted")
+                        print_status(f"Redeemed ${(up_balance + down_balance) / 1e6:.2f} after retry!", "success")
+                        return True
+                    logger.warning("Redeem nonce was taken by another TX, sending at a fresh nonce")
+            
+            if gas_limit is None:
+                gas_limit = estimate_gas_limit(w3, tx_base)
+                logger.debug("Estimated gas limit (with buffer): %s", gas_limit)
+            
+            # Acquire lock to prevent concurrent redemptions picking the same nonce.
+            # The nonce counts pending txs, so it is safe to release once ours is broadcast.
+            if not lock.acquire():
+                print_status("Another redeem in progress, try later", "warn")
+                return False
             try:
-                if attempt > 1:
-                    logger.info(f"Retry {attempt-1}/{max_attempts-1} for redeem...")
-                    if not _silent_context.get("silent"):
-                        print_status(f"Retry {attempt-1}/{max_attempts-1}...", "warn")
-                else:
-                    print_status("Sending redeem transaction...")
+                nonce, priority_fee, max_fee = get_nonce_and_fees(w3, wallet)
                 
-                nonce = w3.eth.get_transaction_count(wallet)
-                gas_price = w3.eth.gas_price
+                if in_flight is not None:
+                    # Still pending - replace it at the same nonce with higher fees
+                    nonce = in_flight["nonce"]
+                    priority_fee = max(priority_fee, int(in_flight["priority_fee"] * REPLACEMENT_FEE_BUMP))
+                    max_fee = max(max_fee, int(in_flight["max_fee"] * REPLACEMENT_FEE_BUMP))
+                    in_flight["priority_fee"] = priority_fee
+                    in_flight["max_fee"] = max_fee
+                    logger.info(f"Replacing pending redeem at nonce {nonce}")
                 
-                logger.debug(f"TX params - nonce: {nonce}, gas_price: {gas_price}, neg_risk: {neg_risk}")
+                logger.debug("TX params - nonce: %s, max_fee: %s, priority_fee: %s, neg_risk: %s", nonce, max_fee, priority_fee, neg_risk)
                 
-                if neg_risk:
-                    # NegRisk markets use NegRisk Adapter
-                    adapter = w3.eth.contract(
-                        address=Web3.to_checksum_address(NEG_RISK_ADAPTER),
-                        abi=NEG_RISK_ABI
-                    )
-                    amounts = [up_balance, down_balance]
-                    logger.debug(f"NegRisk redeem - condition: {condition_id[:20]}..., amounts: {amounts}")
-                    
-                    tx = adapter.functions.redeemPositions(
-                        Web3.to_bytes(hexstr=condition_id),
-                        amounts
-                    ).build_transaction({
-                        "chainId": 137,
-                        "from": wallet,
-                        "nonce": nonce,
-                        "gas": 500000,
-                        "gasPrice": int(gas_price * 1.5),
-                    })
-                else:
-                    # Standard CTF markets use CTF Exchange directly
-                    logger.debug(f"Standard CTF redeem - condition: {condition_id[:20]}...")
-                    index_sets = [1, 2]
-                    parent_collection_id = bytes(32)
-                    
-                    tx = ctf.functions.redeemPositions(
-                        Web3.to_checksum_address(USDC_ADDRESS),
-                        parent_collection_id,
-                        Web3.to_bytes(hexstr=condition_id),
-                        index_sets
-                    ).build_transaction({
-                        "chainId": 137,
-                        "from": wallet,
-                        "nonce": nonce,
-                        "gas": 500000,
-                        "gasPrice": int(gas_price * 1.5),
-                    })
+                tx = {
+                    **tx_base,
+                    "nonce": nonce,
+                    "gas": gas_limit,
+                    "maxFeePerGas": max_fee,
+                    "maxPriorityFeePerGas": priority_fee,
+                }
                 
                 signed_tx = w3.eth.account.sign_transaction(tx, private_key=PRIVATE_KEY)
                 tx_hash = w3.eth.send_raw_transaction(signed_tx.raw_transaction)
-                
-                logger.info(f"TX sent: {tx_hash.hex()}")
-                if not _silent_context.get("silent"):
-                    print(f"  TX: {tx_hash.hex()}")
-                print_status("Waiting for confirmation...")
-                
-                receipt = w3.eth.wait_for_transaction_receipt(tx_hash, timeout=180)
-                
-                if receipt.status == 1:
-                    if attempt > 1:
-                        print_status(f"Redeemed ${(up_balance + down_balance) / 1e6:.2f} after retry!", "success")
-                        logger.info(f"Redeemed after {attempt} attempts")
-                    else:
-                        print_status(f"Redeemed ${(up_balance + down_balance) / 1e6:.2f} USDC!", "success")
-                    return True
-                else:
-                    raise Exception("Transaction reverted")
-                
-            except Exception as e:
-                logger.error(f"Redeem attempt {attempt} failed: {e}")
-                if attempt < max_attempts:
-                    logger.info(f"Waiting {retry_delay}s before retry...")
-                    if not _silent_context.get("silent"):
-                        print_status(f"Failed, retrying in {retry_delay}s...", "warn")
-                    time.sleep(retry_delay)
+                if in_flight is None:
+                    in_flight = {"nonce": nonce, "priority_fee": priority_fee, "max_fee": max_fee, "hashes": []}
+                in_flight["hashes"].append(tx_hash)
+            finally:
+                lock.release()
+            
+            logger.info(f"TX sent: {tx_hash.hex()}")
+            if not _silent_context.get("silent"):
+                print(f"  TX: {tx_hash.hex()}")
+            print_status("Waiting for confirmation...")
+            
+            receipt = wait_for_receipt(w3, tx_hash, timeout=180)
+            
+            in_flight = None  # Mined - the nonce is used up either way
+            if receipt.status == 1:
+                if attempt > 1:
+                    print_status(f"Redeemed ${(up_balance + down_balance) / 1e6:.2f} after retry!", "success")
+                    logger.info(f"Redeemed after {attempt} attempts")
                 else:
-                    print_status(f"Redeem failed after {max_attempts} attempts", "error")
-                    logger.error(f"Redeem failed after {max_attempts} attempts: {e}")
-                    return False
-        
-        return False
-    finally:
-        lock.release()
+                    print_status(f"Redeemed ${(up_balance + down_balance) / 1e6:.2f} USDC!", "success")
+                return True
+            else:
+                raise Exception("Transaction reverted")
+            
+        except Exception as e:
+            logger.error(f"Redeem attempt {attempt} failed: {e}")
+            # Exponential backoff with jitter: ~0.5s, 1s, 2s, 4s (capped at 8s)
+            retry_delay = min(base_delay * (2 ** (attempt - 1)), 8) + random.uniform(0, 0.5)
+            if attempt < max_attempts and time.monotonic() + retry_delay < deadline:
+                logger.info(f"Waiting {retry_delay:.1f}s before retry...")
+                if not _silent_context.get("silent"):
+                    print_status(f"Failed, retrying in {retry_delay:.1f}s...", "warn")
+                time.sleep(retry_delay)
+            else:
+                print_status(f"Redeem failed after {attempt} attempts", "error")
+                logger.error(f"Redeem failed after {attempt} attempts: {e}")
+                if in_flight is not None:
+                    logger.warning(f"Redeem TX may still confirm: {in_flight['hashes'][-1].hex()} (nonce {in_flight['nonce']})")
+                return False
+    
+    return False
 
 
 def main():
@@ -525,16 +821,13 @@ def main():
         sys.exit(1)
     
     logger.info(f"Connecting to Polygon RPC: {RPC_URL}")
-    w3 = Web3(Web3.HTTPProvider(RPC_URL))
-    if not w3.is_connected():
+    w3, wallet = _get_w3()
+    if w3 is None:
         print_status("Cannot connect to Polygon", "error")
         sys.exit(1)
     
     logger.info("Connected to Polygon")
     
-    account = Account.from_key(PRIVATE_KEY)
-    wallet = account.address
-    
     logger.info(f"Wallet: {wallet}")
     
     print(f"\n{Colors.BOLD}{Colors.CYAN}Manual Redeem{Colors.RESET}")
@@ -7,15 +7,33 @@ Prevents concurrent redemptions that could cause nonce collisions.
 import os
 import fcntl
 import time
+import signal
+import threading
 
 LOCK_FILE = "/tmp/redeem.lock"
 
+POLL_INTERVAL = 0.05  # seconds, only used off the main thread
+
+# Same-process waiters queue here (native blocking wait) before touching the file
+_PROCESS_LOCK = threading.Lock()
+
+
+class _LockTimeout(Exception):
+    pass
+
+
+def _raise_timeout(signum, frame):
+    raise _LockTimeout()
+
 
 class RedeemLock:
     """File-based lock for coordinating redemption operations.
     
-    Uses fcntl.flock() for atomic locking across processes.
-    Prevents concurrent auto-redeem and manual /redeemall from racing.
+    Uses fcntl.flock() for atomic locking across processes; the kernel
+    drops it when the holder exits, even on SIGKILL. Threads of one process
+    first queue on a process-wide threading.Lock, so only one of them waits
+    on the file. Prevents concurrent auto-redeem and manual /redeemall from
+    racing.
     """
     
     def __init__(self, timeout: float = 120.0):
@@ -24,32 +42,75 @@ class RedeemLock:
         self._acquired = False
     
     def acquire(self) -> bool:
-        """Acquire lock with timeout. Returns True if acquired."""
-        start = time.time()
+        """Acquire lock with timeout. Returns True if acquired.
+        
+        On the main thread this blocks in flock() with a SIGALRM timeout, so
+        it wakes as soon as the holder releases. Signals can only be handled
+        on the main thread, so other threads poll with a short interval.
+        """
+        deadline = time.monotonic() + self.timeout
+        if not _PROCESS_LOCK.acquire(timeout=self.timeout):
+            return False
         
         try:
             self._fd = open(LOCK_FILE, 'w')
             
-            while time.time() - start < self.timeout:
-                try:
-                    fcntl.flock(self._fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
-                    self._acquired = True
-                    self._fd.write(f"{os.getpid()}\n")
-                    self._fd.flush()
-                    return True
-                except (IOError, OSError):
-                    time.sleep(0.5)
+            remaining = deadline - time.monotonic()
+            if threading.current_thread() is threading.main_thread() and hasattr(signal, "setitimer"):
+                acquired = self._acquire_blocking(remaining)
+            else:
+                acquired = self._acquire_polling(remaining)
+            
+            if acquired:
+                self._acquired = True
+                self._fd.write(f"{os.getpid()}\n")
+                self._fd.flush()
+                return True
             
             self._fd.close()
             self._fd = None
-            return False
             
         except Exception:
             if self._fd:
                 self._fd.close()
                 self._fd = None
+        
+        _PROCESS_LOCK.release()
+        return False
+    
+    def _try_lock(self) -> bool:
+        try:
+            fcntl.flock(self._fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            return True
+        except (IOError, OSError):
             return False
     
+    def _acquire_blocking(self, timeout: float) -> bool:
+        if timeout <= 0:
+            return self._try_lock()  # setitimer(0) would disarm the timer, not fire it
+        
+        previous = signal.signal(signal.SIGALRM, _raise_timeout)
+        try:
+            signal.setitimer(signal.ITIMER_REAL, timeout)
+            try:
+                fcntl.flock(self._fd, fcntl.LOCK_EX)
+            finally:
+                signal.setitimer(signal.ITIMER_REAL, 0)
+        except _LockTimeout:
+            # The timer can fire just as flock() returns - a non-blocking retry settles it
+            return self._try_lock()
+        finally:
+            signal.signal(signal.SIGALRM, previous if previous is not None else signal.SIG_DFL)
+        return True
+    
+    def _acquire_polling(self, timeout: float) -> bool:
+        start = time.time()
+        while time.time() - start < timeout:
+            if self._try_lock():
+                return True
+            time.sleep(POLL_INTERVAL)
+        return self._try_lock()
+    
     def release(self):
         """Release the lock."""
         if self._fd and self._acquired:
@@ -60,3 +121,4 @@ class RedeemLock:
                 pass
             self._acquired = False
             self._fd = None
+            _PROCESS_LOCK.release()
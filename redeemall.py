@@ -8,23 +8,37 @@ and redeems any that are ready (oracle resolved).
 Supports all market types, not just BTC 15-minute markets.
 
 Usage:
-    python3 redeemall.py
+    python3 redeemall.py [--auto-confirm|-y] [--paranoid]
 """
 
 import os
 import sys
 import time
 import json
+import calendar
 import requests
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from urllib3.util.request import ACCEPT_ENCODING
 from datetime import datetime
 from dotenv import load_dotenv
-from web3 import Web3
+from web3.middleware import ExtraDataToPOAMiddleware
 from eth_account import Account
+from eth_keys import keys
+
+try:
+    import orjson  # Optional: faster parsing of Data API responses
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
 
 load_dotenv()
 
 from logger import get_logger, Colors
 from redeem_lock import RedeemLock
+from rpc import encode_call, batch_read, checksum, make_web3, wait_for_receipts
 
 logger = get_logger("redeemall")
 
@@ -35,10 +49,52 @@ RPC_URL = os.getenv("RPC_URL", "https://polygon-rpc.com")
 GAMMA_API = "https://gamma-api.polymarket.com"
 DATA_API = "https://data-api.polymarket.com"
 
+# Keep-alive session for Data API calls (reuses the TLS connection across polls)
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=10,
+    # Back off only when the API actually pushes back (honours Retry-After on 429)
+    max_retries=Retry(
+        total=5,
+        backoff_factor=0.5,
+        status_forcelist=[429, 502, 503, 504],
+        respect_retry_after_header=True,
+    ),
+))
+_SESSION.headers.update({
+    "Accept": "application/json",
+    "Accept-Encoding": ACCEPT_ENCODING,  # gzip/deflate, plus br/zstd when their decoders are installed
+    "User-Agent": "polyterminal-redeemall",
+})
+
+# Only the Data API position fields find_all_positions reads
+POSITION_FIELDS = "conditionId,slug,title,negativeRisk,endDate,redeemable,mergeable,outcome,asset,size,curPrice"
+
 USDC_ADDRESS = "0x2791Bca1f2de4661ED88A30C99A7a9449Aa84174"
 CTF_ADDRESS = "0x4D97DCd97eC945f40cF65F87097ACe5EA0476045"
 NEG_RISK_ADAPTER = "0xd91E80cF2E7be2e162c6513ceD06f1dD0dA35296"
 
+# Checksummed once at import (avoids a keccak per redeem)
+USDC_ADDRESS_CS = checksum(USDC_ADDRESS)
+CTF_ADDRESS_CS = checksum(CTF_ADDRESS)
+NEG_RISK_ADAPTER_CS = checksum(NEG_RISK_ADAPTER)
+FUNDER_CHECKSUM = checksum(FUNDER_ADDRESS) if FUNDER_ADDRESS else None
+
+# Proxy wallets (type 1/2) redeem through the Gnosis Safe at FUNDER_ADDRESS
+SIG_IS_PROXY = SIGNATURE_TYPE in (1, 2) and bool(FUNDER_ADDRESS)
+
+ZERO_ADDRESS = "0x" + "00" * 20
+
+# Outcome names treated as the UP / DOWN side of a binary market
+UP_OUTCOMES = frozenset(("Up", "YES", "Higher"))
+DOWN_OUTCOMES = frozenset(("Down", "NO", "Lower"))
+
+# Node errors meaning the (shared, prefetched) gas price is too low to be accepted
+UNDERPRICED_ERRORS = ("underpriced", "fee too low")
+# Minimum raise over a rejected gas price (nodes need +10% to replace a TX)
+UNDERPRICED_BUMP = 1.1
+
 CTF_ABI = json.loads('''[
     {
         "inputs": [
@@ -132,6 +188,47 @@ GNOSIS_SAFE_ABI = json.loads('''[
     }
 ]''')
 
+
+@lru_cache(maxsize=4)
+def _ctf(w3):
+    """CTF contract bound to w3 (built once per Web3 instance)."""
+    return w3.eth.contract(address=CTF_ADDRESS_CS, abi=CTF_ABI)
+
+
+@lru_cache(maxsize=4)
+def _adapter(w3):
+    """NegRisk adapter contract bound to w3 (built once per Web3 instance)."""
+    return w3.eth.contract(address=NEG_RISK_ADAPTER_CS, abi=NEG_RISK_ABI)
+
+
+@lru_cache(maxsize=4)
+def _safe(w3):
+    """Gnosis Safe (FUNDER_ADDRESS) contract bound to w3 (built once per Web3 instance)."""
+    return w3.eth.contract(address=FUNDER_CHECKSUM, abi=GNOSIS_SAFE_ABI)
+
+
+@lru_cache(maxsize=2)
+def _signer_key(private_key):
+    """eth_keys PrivateKey for signing raw 32-byte digests (parsed once per key)."""
+    return keys.PrivateKey(bytes.fromhex(private_key[2:] if private_key.startswith("0x") else private_key))
+
+
+def _iso_to_epoch(value):
+    """Epoch seconds for a UTC ISO-8601 date/time like '2025-01-31' or '2025-01-31T12:00:00Z'.
+    
+    Slices the fixed-width fields straight into calendar.timegm; anything with
+    an explicit offset goes through datetime.fromisoformat instead.
+    """
+    if len(value) == 10:
+        return calendar.timegm((int(value[0:4]), int(value[5:7]), int(value[8:10]), 0, 0, 0, 0, 0, 0))
+    if len(value) == 19 or value.endswith("Z"):
+        return calendar.timegm((
+            int(value[0:4]), int(value[5:7]), int(value[8:10]),
+            int(value[11:13]), int(value[14:16]), int(value[17:19]), 0, 0, 0
+        ))
+    return datetime.fromisoformat(value).timestamp()
+
+
 def print_status(message, status="info"):
     """Print status message and log to file."""
     logger.info(f"[{status.upper()}] {message}")
@@ -154,20 +251,48 @@ def get_token_balance(w3, ctf, wallet, token_id):
         return 0
 
 
-def check_oracle_resolution(w3, ctf, condition_id):
-    """Check if oracle has resolved the market.
+def check_oracle_resolutions(w3, ctf, positions):
+    """Check oracle resolution for many markets in one batched read.
     
     Returns:
-        bool: True if payoutDenominator > 0 (market resolved)
+        list[bool]: True per position if payoutDenominator > 0 (market resolved)
     """
+    if not positions:
+        return []
+    
+    calls = [encode_call(ctf, "payoutDenominator", [pos["condition_bytes"]]) for pos in positions]
     try:
-        condition_bytes = Web3.to_bytes(hexstr=condition_id)
-        payout_denom = ctf.functions.payoutDenominator(condition_bytes).call()
-        logger.debug(f"Oracle check - condition: {condition_id[:20]}..., payoutDenominator: {payout_denom}")
-        return payout_denom > 0
+        payout_denoms = batch_read(w3, calls)
     except Exception as e:
         logger.error(f"Oracle check error: {e}")
-        return False
+        return [False] * len(positions)
+    
+    resolved = []
+    for pos, payout_denom in zip(positions, payout_denoms):
+        logger.debug(f"Oracle check - condition: {pos['condition_id'][:20]}..., payoutDenominator: {payout_denom}")
+        resolved.append(bool(payout_denom))
+    return resolved
+
+
+def prefetch_redeem_state(w3, ctf, positions):
+    """Read oracle resolution and the gas price concurrently before redeeming.
+    
+    Both are independent read-only RPCs, so the wait is the slower of the two
+    rather than their sum.
+    
+    Returns:
+        tuple: (list[bool] resolved per position, gas_price or None)
+    """
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        resolved_future = executor.submit(check_oracle_resolutions, w3, ctf, positions)
+        gas_future = executor.submit(lambda: w3.eth.gas_price)
+        resolved = resolved_future.result()
+        try:
+            gas_price = gas_future.result()
+        except Exception as e:
+            logger.warning(f"Gas price prefetch failed, fetching per redeem: {e}")
+            gas_price = None
+    return resolved, gas_price
 
 
 def find_all_positions(w3, wallet):
@@ -181,8 +306,6 @@ def find_all_positions(w3, wallet):
     print_status("Fetching positions from Polymarket Data API...")
     logger.info(f"Fetching positions for wallet: {wallet}")
     
-    time.sleep(0.5)  # Pause before API request
-    
     active = []          # Still trading
     pending = []         # Closed but oracle not resolved
     redeemable = []      # Ready to redeem
@@ -193,49 +316,51 @@ def find_all_positions(w3, wallet):
         params = {
             "user": wallet,
             "limit": 500,  # Get all positions
-            "sizeThreshold": 0.01  # Ignore dust positions < $0.01
+            "sizeThreshold": 0.01,  # Ignore dust positions < $0.01
+            "fields": POSITION_FIELDS,  # Projection - ignored by the API if unsupported
         }
         
         logger.debug(f"Requesting: {url} with params: {params}")
-        response = requests.get(url, params=params, timeout=30)
+        response = _SESSION.get(url, params=params, timeout=30)
         
         if response.status_code != 200:
             logger.error(f"Data API returned {response.status_code}: {response.text}")
             print_status(f"API Error: {response.status_code}", "error")
             return active, pending, redeemable
         
-        positions = response.json()
+        positions = _json_loads(response.content)
         logger.info(f"Found {len(positions)} positions from API")
         
         if not positions:
             logger.info("No positions found on wallet")
             return active, pending, redeemable
         
-        # Group positions by conditionId to handle both outcomes together
+        # Group positions by conditionId to handle both outcomes together (single pass)
         positions_by_condition = {}
         for pos in positions:
-            condition_id = pos.get("conditionId")
+            get = pos.get
+            condition_id = get("conditionId")
             if not condition_id:
                 continue
             
-            if condition_id not in positions_by_condition:
-                positions_by_condition[condition_id] = {
-                    "slug": pos.get("slug", "unknown"),
-                    "title": pos.get("title", "Unknown Market"),
+            entry = positions_by_condition.get(condition_id)
+            if entry is None:
+                entry = positions_by_condition[condition_id] = {
+                    "slug": get("slug", "unknown"),
+                    "title": get("title", "Unknown Market"),
                     "condition_id": condition_id,
-                    "neg_risk": pos.get("negativeRisk", False),
-                    "end_date": pos.get("endDate"),
-                    "redeemable": pos.get("redeemable", False),
-                    "mergeable": pos.get("mergeable", False),
+                    "neg_risk": get("negativeRisk", False),
+                    "end_date": get("endDate"),
+                    "redeemable": get("redeemable", False),
+                    "mergeable": get("mergeable", False),
                     "outcomes": {}
                 }
             
             # Store outcome data
-            outcome = pos.get("outcome", "")
-            positions_by_condition[condition_id]["outcomes"][outcome] = {
-                "asset": pos.get("asset"),
-                "size": int(float(pos.get("size", 0)) * 1e6),  # Convert to Wei
-                "cur_price": pos.get("curPrice", 0),
+            entry["outcomes"][get("outcome", "")] = {
+                "asset": get("asset"),
+                "size": int(float(get("size", 0)) * 1e6),  # Convert to Wei
+                "cur_price": get("curPrice", 0),
             }
         
         # Now categorize each position
@@ -246,8 +371,12 @@ def find_all_positions(w3, wallet):
             outcomes = pos_data["outcomes"]
             
             # Try to identify Up/Down outcomes
-            up_data = outcomes.get("Up") or outcomes.get("YES") or outcomes.get("Higher")
-            down_data = outcomes.get("Down") or outcomes.get("NO") or outcomes.get("Lower")
+            up_data = down_data = None
+            for outcome, data in outcomes.items():
+                if outcome in UP_OUTCOMES:
+                    up_data = data
+                elif outcome in DOWN_OUTCOMES:
+                    down_data = data
             
             # If we can't identify, just take first two outcomes
             if not up_data and not down_data:
@@ -266,6 +395,8 @@ def find_all_positions(w3, wallet):
                 "slug": pos_data["slug"],
                 "title": pos_data["title"],
                 "condition_id": condition_id,
+                # bytes32 decoded once, reused by the oracle scan and the redeem TX
+                "condition_bytes": bytes.fromhex(condition_id[2:] if condition_id.startswith("0x") else condition_id),
                 "up_token_id": up_data.get("asset") if up_data else None,
                 "down_token_id": down_data.get("asset") if down_data else None,
                 "up_balance": up_balance,
@@ -278,7 +409,7 @@ def find_all_positions(w3, wallet):
             is_closed = False
             if end_date:
                 try:
-                    end_timestamp = datetime.fromisoformat(end_date.replace('Z', '+00:00')).timestamp()
+                    end_timestamp = _iso_to_epoch(end_date)
                     is_closed = now >= end_timestamp
                 except:
                     pass
@@ -286,6 +417,7 @@ def find_all_positions(w3, wallet):
             if pos_data["redeemable"]:
                 # Ready to redeem - oracle has resolved
                 logger.info(f"Found redeemable: {pos_data['slug']} - UP={up_balance/1e6:.2f}, DOWN={down_balance/1e6:.2f}")
+                position_data["api_redeemable_trusted"] = True  # Data API only flags resolved markets
                 redeemable.append(position_data)
             elif is_closed:
                 # Market closed but not yet redeemable
@@ -308,8 +440,22 @@ def find_all_positions(w3, wallet):
     return active, pending, redeemable
 
 
-def redeem_position(w3, wallet, private_key, position):
-    """Redeem a position with file lock to prevent concurrent operations."""
+def send_redeem(w3, ctf, wallet, private_key, position, nonce, gas_price=None, safe_nonce=None):
+    """Build, sign and broadcast the redeem TX for a position at the given nonce.
+    
+    Does not wait for the receipt (see wait_for_receipts), so several redeems can be
+    in flight at consecutive nonces.
+    
+    Args:
+        nonce: EOA nonce to use for this transaction
+        gas_price: Prefetched gas price (wei); fetched here when None
+        safe_nonce: Known Safe nonce for the proxy path; read on-chain when None
+    
+    Returns:
+        tuple: (tx_hash, gas_price) - tx_hash is None if the TX was not
+        broadcast (nonce left unused); gas_price is the base price used,
+        raised if the node rejected it as underpriced
+    """
     condition_id = position["condition_id"]
     up_balance = position["up_balance"]
     down_balance = position["down_balance"]
@@ -323,95 +469,62 @@ def redeem_position(w3, wallet, private_key, position):
     print_status(f"Redeeming: {position['slug']}")
     print(f"    UP: {up_balance / 1e6:.2f}  DOWN: {down_balance / 1e6:.2f}")
     
-    # Pause to avoid rate limits
-    time.sleep(0.5)
-    
-    # Check oracle resolution first
-    ctf = w3.eth.contract(address=Web3.to_checksum_address(CTF_ADDRESS), abi=CTF_ABI)
-    if not check_oracle_resolution(w3, ctf, condition_id):
-        print_status(f"Skipping - oracle not resolved yet", "warn")
-        logger.warning(f"Skipping {position['slug']} - oracle has not resolved (payoutDenominator=0)")
-        return False
-    
-    time.sleep(0.5)  # Pause after oracle check
-    
-    # Acquire lock to prevent concurrent redemptions
-    lock = RedeemLock(timeout=60.0)
-    if not lock.acquire():
-        print_status("Another redeem in progress, skipping", "warn")
-        return False
-    
     try:
-        # Determine if we need to use Gnosis Safe execTransaction (for Proxy wallet)
-        use_proxy_safe = (SIGNATURE_TYPE in [1, 2] and FUNDER_ADDRESS)
+        if gas_price is None:
+            gas_price = w3.eth.gas_price
         
-        if use_proxy_safe:
+        # Gnosis Safe execTransaction for Proxy wallets, direct call for EOA
+        if SIG_IS_PROXY:
             # FOR PROXY WALLET: Call execTransaction on Gnosis Safe
             logger.info("Using Gnosis Safe execTransaction for Proxy wallet redeem")
             print(f"{Colors.YELLOW}    [Proxy Wallet] Using Gnosis Safe execTransaction{Colors.RESET}")
             
-            # Step 1: Encode the redeemPositions call
-            # Use FUNDER_ADDRESS (Safe wallet) as "from" for encoding
-            safe_address = Web3.to_checksum_address(FUNDER_ADDRESS)
-            
+            # Step 1: Encode the redeemPositions call (executed by the Safe)
             if is_neg_risk:
-                adapter = w3.eth.contract(
-                    address=Web3.to_checksum_address(NEG_RISK_ADAPTER),
-                    abi=NEG_RISK_ABI
-                )
+                adapter = _adapter(w3)
                 amounts = [up_balance, down_balance]
-                # Encode using build_transaction then extract data
-                temp_tx = adapter.functions.redeemPositions(
-                    Web3.to_bytes(hexstr=condition_id),
+                # Local ABI encode - no RPC round-trips
+                redeem_data = adapter.encode_abi("redeemPositions", args=[
+                    position["condition_bytes"],
                     amounts
-                ).build_transaction({"from": safe_address})
-                redeem_data = temp_tx['data']
-                target_contract = NEG_RISK_ADAPTER
+                ])
+                target_contract = NEG_RISK_ADAPTER_CS
             else:
                 index_sets = [1, 2]
                 parent_collection_id = bytes(32)
-                # Encode using build_transaction then extract data
-                temp_tx = ctf.functions.redeemPositions(
-                    Web3.to_checksum_address(USDC_ADDRESS),
+                # Local ABI encode - no RPC round-trips
+                redeem_data = ctf.encode_abi("redeemPositions", args=[
+                    USDC_ADDRESS_CS,
                     parent_collection_id,
-                    Web3.to_bytes(hexstr=condition_id),
+                    position["condition_bytes"],
                     index_sets
-                ).build_transaction({"from": safe_address})
-                redeem_data = temp_tx['data']
-                target_contract = CTF_ADDRESS
+                ])
+                target_contract = CTF_ADDRESS_CS
             
             logger.debug(f"Encoded redeem data: {redeem_data[:100]}...")
             
-            # Step 2: Get EOA (owner) address and nonce
+            # Step 2: Get EOA (owner) address
             account = Account.from_key(private_key)
             owner_address = account.address
             
-            time.sleep(0.5)
-            eoa_nonce = w3.eth.get_transaction_count(owner_address)
-            
-            time.sleep(0.3)
-            gas_price = w3.eth.gas_price
-            
             # Step 3: Build execTransaction on Gnosis Safe
-            safe = w3.eth.contract(
-                address=Web3.to_checksum_address(FUNDER_ADDRESS),
-                abi=GNOSIS_SAFE_ABI
-            )
+            safe = _safe(w3)
             
-            # Get Safe nonce
-            safe_nonce = safe.functions.nonce().call()
+            # Get Safe nonce (unless the caller is tracking it)
+            if safe_nonce is None:
+                safe_nonce = safe.functions.nonce().call()
             logger.info(f"Safe nonce: {safe_nonce}, Owner: {owner_address}")
             
             # Safe transaction parameters
-            to = Web3.to_checksum_address(target_contract)
+            to = target_contract
             value = 0
             data = redeem_data
             operation = 0  # CALL
             safeTxGas = 0
             baseGas = 0
             gasPrice_safe = 0
-            gasToken = "0x0000000000000000000000000000000000000000"
-            refundReceiver = "0x0000000000000000000000000000000000000000"
+            gasToken = ZERO_ADDRESS
+            refundReceiver = ZERO_ADDRESS
             
             # For 1-of-1 Safe, we need owner signature
             # Build signature: just sign the Safe transaction hash
@@ -423,15 +536,13 @@ def redeem_position(w3, wallet, private_key, position):
             
             logger.debug(f"Safe TX hash to sign: {tx_hash_to_sign.hex()}")
             
-            # Sign with owner's private key (direct hash signature for Gnosis Safe)
-            # Use unsafe_sign_hash to sign the raw hash without message prefix
-            signed_msg = account.unsafe_sign_hash(tx_hash_to_sign)
+            # Sign the raw Safe TX hash (no message prefix) directly with eth_keys
+            signed_msg = _signer_key(private_key).sign_msg_hash(tx_hash_to_sign)
             
-            # Build signature in Gnosis Safe format: r (32 bytes) + s (32 bytes) + v (1 byte)
+            # Build signature in Gnosis Safe format: r (32 bytes) + s (32 bytes) + v (1 byte, 27/28)
             r = signed_msg.r.to_bytes(32, byteorder='big')
             s = signed_msg.s.to_bytes(32, byteorder='big')
-            v = signed_msg.v
-            signature = r + s + bytes([v])
+            signature = r + s + bytes([signed_msg.v + 27])
             
             logger.debug(f"Signature (r+s+v): {signature.hex()[:100]}...")
             
@@ -443,7 +554,7 @@ def redeem_position(w3, wallet, private_key, position):
             ).build_transaction({
                 "chainId": 137,
                 "from": owner_address,
-                "nonce": eoa_nonce,
+                "nonce": nonce,
                 "gas": 1000000,
                 "gasPrice": int(gas_price * 1.2),
             })
@@ -455,24 +566,15 @@ def redeem_position(w3, wallet, private_key, position):
             # FOR EOA WALLET: Direct call to CTF contract
             logger.info("Using direct CTF contract call for EOA wallet")
             
-            time.sleep(0.5)
-            nonce = w3.eth.get_transaction_count(wallet)
-            
-            time.sleep(0.3)
-            gas_price = w3.eth.gas_price
-            
             logger.debug(f"TX params - nonce: {nonce}, gas_price: {gas_price}")
             
             if is_neg_risk:
-                adapter = w3.eth.contract(
-                    address=Web3.to_checksum_address(NEG_RISK_ADAPTER),
-                    abi=NEG_RISK_ABI
-                )
+                adapter = _adapter(w3)
                 amounts = [up_balance, down_balance]
                 logger.debug(f"NegRisk redeem - condition: {condition_id}, amounts: {amounts}")
                 
                 tx = adapter.functions.redeemPositions(
-                    Web3.to_bytes(hexstr=condition_id),
+                    position["condition_bytes"],
                     amounts
                 ).build_transaction({
                     "chainId": 137,
@@ -487,9 +589,9 @@ def redeem_position(w3, wallet, private_key, position):
                 parent_collection_id = bytes(32)
                 
                 tx = ctf.functions.redeemPositions(
-                    Web3.to_checksum_address(USDC_ADDRESS),
+                    USDC_ADDRESS_CS,
                     parent_collection_id,
-                    Web3.to_bytes(hexstr=condition_id),
+                    position["condition_bytes"],
                     index_sets
                 ).build_transaction({
                     "chainId": 137,
@@ -501,60 +603,131 @@ def redeem_position(w3, wallet, private_key, position):
             
             print(f"{Colors.DIM}    TX from: {wallet[:10]}...{wallet[-8:]}{Colors.RESET}")
         
-        time.sleep(0.5)  # Pause before signing and sending
-        
         signed_tx = w3.eth.account.sign_transaction(tx, private_key=private_key)
         logger.info("Transaction signed, broadcasting...")
         
-        tx_hash = w3.eth.send_raw_transaction(signed_tx.raw_transaction)
-        logger.info(f"TX broadcast: {tx_hash.hex()}")
+        try:
+            tx_hash = w3.eth.send_raw_transaction(signed_tx.raw_transaction)
+        except Exception as e:
+            # The shared gas price may have gone stale - raise it once and resend
+            if not any(msg in str(e).lower() for msg in UNDERPRICED_ERRORS):
+                raise
+            gas_price = max(w3.eth.gas_price, int(gas_price * UNDERPRICED_BUMP))
+            tx["gasPrice"] = int(gas_price * 1.2)
+            logger.warning(f"Gas price too low ({e}), retrying with {tx['gasPrice']}")
+            signed_tx = w3.eth.account.sign_transaction(tx, private_key=private_key)
+            tx_hash = w3.eth.send_raw_transaction(signed_tx.raw_transaction)
+        logger.info(f"TX broadcast: {tx_hash.hex()} (nonce {nonce})")
         
         print(f"    TX: {tx_hash.hex()}")
+        return tx_hash, gas_price
         
-        # Wait for receipt with retries on rate limit
-        max_retries = 3
-        for attempt in range(max_retries):
-            try:
-                time.sleep(1)  # Pause before checking receipt
-                receipt = w3.eth.wait_for_transaction_receipt(tx_hash, timeout=120)
-                logger.debug(f"TX receipt: status={receipt.get('status')}, gas_used={receipt.get('gasUsed')}")
-                break
-            except Exception as e:
-                if 'rate limit' in str(e).lower() and attempt < max_retries - 1:
-                    logger.warning(f"Rate limit on receipt check, retrying in 3s...")
-                    time.sleep(3)
-                    continue
-                raise
+    except Exception as e:
+        logger.exception(f"Redeem error for {position['slug']}: {e}")
+        print_status(f"Error: {e}", "error")
+        return None, gas_price
+
+
+def report_redeem(position, tx_hash, receipt):
+    """Report the outcome of a mined (or timed-out) redeem TX.
+    
+    Returns:
+        bool: True if the TX succeeded
+    """
+    if receipt is None:
+        logger.error(f"TX for {position['slug']} not mined in time: {tx_hash.hex()}")
+        print_status(f"TX for {position['slug']} not confirmed yet", "warn")
+        print(f"{Colors.DIM}Check TX on: https://polygonscan.com/tx/{tx_hash.hex()}{Colors.RESET}")
+        return False
+    
+    status = receipt.get("status")
+    gas_used = receipt.get("gasUsed")
+    
+    logger.info(f"TX completed for {position['slug']} - status: {status}, gas_used: {gas_used}")
+    print(f"    {position['slug']}: Status: {status} | Gas: {gas_used}")
+    
+    if status == 1:
+        print_status(f"Redeemed {position['slug']}!", "success")
+        return True
+    else:
+        logger.error("TX REVERTED - status=%s gasUsed=%s", status, gas_used)
+        logger.debug("Full receipt: %s", receipt)
+        print_status(f"TX FAILED for {position['slug']} (status={status})", "error")
+        print(f"{Colors.RED}Transaction was sent but REVERTED on blockchain!{Colors.RESET}")
+        print(f"{Colors.DIM}Check TX on: https://polygonscan.com/tx/{tx_hash.hex()}{Colors.RESET}")
+        return False
+
+
+def redeem_positions(w3, ctf, wallet, private_key, positions, gas_price=None):
+    """Redeem positions with file lock to prevent concurrent operations.
+    
+    Transactions are broadcast back-to-back at consecutive nonces and their
+    receipts polled together, so the run takes about one confirmation time
+    instead of one per position. Proxy (Safe) redeems are awaited one by one
+    because each execTransaction consumes the next Safe nonce on-chain; that
+    nonce is read once and advanced locally, and re-read after a failure.
+    
+    Returns:
+        list: Positions that were redeemed successfully
+    """
+    # Acquire lock to prevent concurrent redemptions
+    lock = RedeemLock(timeout=60.0)
+    if not lock.acquire():
+        print_status("Another redeem in progress, skipping", "warn")
+        return []
+    
+    try:
+        nonce = w3.eth.get_transaction_count(wallet, "pending")
+        safe_nonce = _safe(w3).functions.nonce().call() if SIG_IS_PROXY else None
         
-        status = receipt.get("status")
-        gas_used = receipt.get("gasUsed")
+        redeemed = []
+        in_flight = []
+        for pos in positions:
+            tx_hash, gas_price = send_redeem(w3, ctf, wallet, private_key, pos, nonce,
+                                             gas_price=gas_price, safe_nonce=safe_nonce)
+            if tx_hash is None:
+                continue  # Not broadcast - reuse the nonce for the next position
+            nonce += 1
+            
+            if SIG_IS_PROXY:
+                receipt = wait_for_receipts(w3, [tx_hash]).get(tx_hash)
+                if report_redeem(pos, tx_hash, receipt):
+                    redeemed.append(pos)
+                    if safe_nonce is not None:
+                        safe_nonce += 1
+                else:
+                    safe_nonce = None  # Reverted - re-read the Safe nonce for the next redeem
+            else:
+                in_flight.append((pos, tx_hash))
         
-        logger.info(f"TX completed - status: {status}, gas_used: {gas_used}")
-        print(f"    Status: {status} | Gas: {gas_used}")
+        if in_flight:
+            print_status(f"Waiting for {len(in_flight)} redeem TX(s)...")
+            receipts = wait_for_receipts(w3, [tx_hash for _, tx_hash in in_flight])
+            for pos, tx_hash in in_flight:
+                if report_redeem(pos, tx_hash, receipts.get(tx_hash)):
+                    redeemed.append(pos)
         
-        if status == 1:
-            print_status("Redeemed!", "success")
-            return True
-        else:
-            logger.error(f"TX REVERTED - receipt: {dict(receipt)}")
-            print_status(f"TX FAILED (status={status})", "error")
-            print(f"{Colors.RED}Transaction was sent but REVERTED on blockchain!{Colors.RESET}")
-            print(f"{Colors.DIM}Check TX on: https://polygonscan.com/tx/{tx_hash.hex()}{Colors.RESET}")
-            return False
+        return redeemed
         
+    except requests.exceptions.ConnectionError as e:
+        logger.error(f"Cannot connect to Polygon RPC {RPC_URL}: {e}")
+        print_status("Cannot connect to Polygon", "error")
+        return []
     except Exception as e:
-        logger.exception(f"Redeem error for {position['slug']}: {e}")
+        logger.exception(f"Redeem pass error: {e}")
         print_status(f"Error: {e}", "error")
-        return False
+        return []
     finally:
         lock.release()
 
 
-def main(auto_confirm=False):
+def main(auto_confirm=False, paranoid=False):
     """Main function with optional auto-confirmation
     
     Args:
         auto_confirm: If True, automatically confirm redemption without prompting
+        paranoid: If True, re-check oracle resolution on-chain even for positions
+            the Data API already marked redeemable
     """
     logger.info("=" * 50)
     logger.info("REDEEMALL STARTED")
@@ -565,18 +738,12 @@ def main(auto_confirm=False):
         sys.exit(1)
     
     logger.info(f"Connecting to Polygon RPC: {RPC_URL}")
-    w3 = Web3(Web3.HTTPProvider(RPC_URL))
+    w3 = make_web3(RPC_URL, timeout=30)  # Keep-alive session; sleeps only on 429 / -32005
     
     # Add POA middleware for Polygon (POA chain)
-    from web3.middleware import ExtraDataToPOAMiddleware
+    # No is_connected() probe - an unreachable RPC surfaces on the first real call
     w3.middleware_onion.inject(ExtraDataToPOAMiddleware, layer=0)
     
-    if not w3.is_connected():
-        print_status("Cannot connect to Polygon", "error")
-        sys.exit(1)
-    
-    logger.info("Connected to Polygon")
-    
     account = Account.from_key(PRIVATE_KEY)
     signer_address = account.address  # Address that signs and sends transactions
     
@@ -668,22 +835,31 @@ def main(auto_confirm=False):
     
     print()
     
-    redeemed = 0
-    total_value = 0
-    
+    # The Data API's redeemable flag already means the oracle resolved; only
+    # re-check on-chain (one batched read, alongside the gas price) when asked to
+    ctf = _ctf(w3)
+    to_verify = [pos for pos in redeemable if paranoid or not pos.get("api_redeemable_trusted")]
+    resolved, gas_price = prefetch_redeem_state(w3, ctf, to_verify)
+    unresolved = {pos["condition_id"] for pos, is_resolved in zip(to_verify, resolved) if not is_resolved}
+    ready = []
     for pos in redeemable:
-        # Pass both signer address (for TX) and wallet_to_check (for token location)
-        if redeem_position(w3, redeem_from_address, PRIVATE_KEY, pos):
-            redeemed += 1
-            total_value += (pos["up_balance"] + pos["down_balance"]) / 1e6
-        time.sleep(2)  # Longer pause between redemptions to avoid rate limits
+        if pos["condition_id"] not in unresolved:
+            ready.append(pos)
+        else:
+            print_status(f"Skipping {pos['slug']} - oracle not resolved yet", "warn")
+            logger.warning(f"Skipping {pos['slug']} - oracle has not resolved (payoutDenominator=0)")
+    
+    # Redeem TXs are always sent FROM the signer (tokens may sit on wallet_to_check)
+    redeemed = redeem_positions(w3, ctf, redeem_from_address, PRIVATE_KEY, ready, gas_price=gas_price)
+    total_value = sum((pos["up_balance"] + pos["down_balance"]) / 1e6 for pos in redeemed)
     
     print(f"\n{Colors.GREEN}{Colors.BOLD}Done!{Colors.RESET}")
-    print(f"Redeemed: {redeemed}/{len(redeemable)}")
+    print(f"Redeemed: {len(redeemed)}/{len(redeemable)}")
     print(f"Value: ~${total_value:.2f} USDC\n")
 
 
 if __name__ == "__main__":
-    # Check for --auto-confirm flag
+    # Check for --auto-confirm / --paranoid flags
     auto_confirm = "--auto-confirm" in sys.argv or "-y" in sys.argv
-    main(auto_confirm=auto_confirm)
+    paranoid = "--paranoid" in sys.argv
+    main(auto_confirm=auto_confirm, paranoid=paranoid)
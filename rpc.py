@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+"""
+Shared Polygon RPC helpers.
+
+Features:
+- Multicall3 batching (many read-only eth_calls in one round-trip)
+- Parallel eth_call fallback for chains/RPCs without Multicall3
+- Reactive backoff only when the RPC rate-limits (HTTP 429 / -32005)
+- Pooled keep-alive HTTP session for the Web3 provider
+- Cached checksum-address encoding
+- Precomputed selectors for raw ERC20 / balance calldata (no Contract objects)
+- orjson response decoding when available (large Multicall3 payloads)
+- Batched receipt polling for several in-flight transactions
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from eth_abi import encode as abi_encode
+from web3 import Web3
+from web3.exceptions import TransactionNotFound
+
+try:
+    import orjson  # Optional: faster JSON-RPC response decoding
+except ImportError:
+    orjson = None
+
+# Multicall3 - deployed at the same address on Polygon and most EVM chains
+MULTICALL3_ADDRESS = "0xcA11bde05977b3631167028862bE2a173976CA11"
+
+MULTICALL3_ABI = [
+    {
+        "inputs": [
+            {"name": "requireSuccess", "type": "bool"},
+            {
+                "components": [
+                    {"name": "target", "type": "address"},
+                    {"name": "callData", "type": "bytes"}
+                ],
+                "name": "calls",
+                "type": "tuple[]"
+            }
+        ],
+        "name": "tryAggregate",
+        "outputs": [
+            {
+                "components": [
+                    {"name": "success", "type": "bool"},
+                    {"name": "returnData", "type": "bytes"}
+                ],
+                "name": "returnData",
+                "type": "tuple[]"
+            }
+        ],
+        "stateMutability": "payable",
+        "type": "function"
+    },
+    {
+        "inputs": [{"name": "addr", "type": "address"}],
+        "name": "getEthBalance",
+        "outputs": [{"name": "balance", "type": "uint256"}],
+        "stateMutability": "view",
+        "type": "function"
+    }
+]
+
+def selector(signature: str) -> bytes:
+    """4-byte function selector for a canonical signature like 'balanceOf(address)'."""
+    return Web3.keccak(text=signature)[:4]
+
+
+GET_ETH_BALANCE_SELECTOR = selector("getEthBalance(address)")
+BALANCE_OF_SELECTOR = selector("balanceOf(address)")
+ALLOWANCE_SELECTOR = selector("allowance(address,address)")
+
+PARALLEL_WORKERS = 8
+
+RPC_TIMEOUT = 10  # seconds
+
+RATE_LIMIT_BACKOFF = (0.1, 0.2, 0.4, 0.8)  # seconds between retries
+RATE_LIMIT_ERROR_CODE = -32005  # JSON-RPC "limit exceeded"
+
+RECEIPT_POLL_INTERVAL = 2.0  # seconds - about one Polygon block
+RECEIPT_POLL_MAX = 8.0  # seconds - backoff cap between inclusion checks
+
+
+def _retry_after(response, default):
+    """Seconds to wait from a 429 Retry-After header, or default."""
+    try:
+        return min(float(response.headers.get("Retry-After")), 10.0)
+    except (TypeError, ValueError):
+        return default
+
+
+class RateLimitedProvider(Web3.HTTPProvider):
+    """HTTPProvider that sleeps only when the RPC says it is rate limited.
+    
+    Retries on HTTP 429 (honouring Retry-After) and on JSON-RPC -32005,
+    backing off 0.1/0.2/0.4/0.8s. Any other response is returned as-is.
+    """
+    
+    def make_request(self, method, params):
+        for delay in RATE_LIMIT_BACKOFF + (None,):
+            try:
+                response = super().make_request(method, params)
+            except requests.exceptions.HTTPError as e:
+                if delay is None or e.response is None or e.response.status_code != 429:
+                    raise
+                time.sleep(_retry_after(e.response, delay))
+                continue
+            
+            error = response.get("error") if isinstance(response, dict) else None
+            if delay is None or not isinstance(error, dict) or error.get("code") != RATE_LIMIT_ERROR_CODE:
+                return response
+            time.sleep(delay)
+    
+    def decode_rpc_response(self, raw_response):
+        if orjson is not None:
+            try:
+                return orjson.loads(raw_response)
+            except orjson.JSONDecodeError:
+                pass  # e.g. integers beyond 64 bits - let web3's decoder handle it
+        return super().decode_rpc_response(raw_response)
+
+
+def make_session(pool_connections=8, pool_maxsize=16):
+    """Create a pooled keep-alive requests session for RPC traffic.
+    
+    Reusing one session avoids a fresh TCP+TLS handshake per eth_call.
+    Transient gateway errors (502/503) are retried with backoff; 429 is
+    left to RateLimitedProvider so it can also see JSON-RPC -32005.
+    """
+    retry = Retry(
+        total=3,
+        backoff_factor=0.25,
+        status_forcelist=[502, 503],
+        allowed_methods=None,  # JSON-RPC is POST - retry it too
+    )
+    adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize, max_retries=retry)
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def make_web3(rpc_url, timeout=RPC_TIMEOUT):
+    """Create a rate-limit-aware Web3 instance backed by a pooled keep-alive session."""
+    provider = RateLimitedProvider(
+        rpc_url,
+        request_kwargs={"timeout": timeout},
+        session=make_session(),
+        exception_retry_configuration=None,  # Retries handled by the session + RateLimitedProvider
+    )
+    return Web3(provider)
+
+
+@lru_cache(maxsize=64)
+def checksum(address: str) -> str:
+    """Checksum-encode an address, caching the keccak per distinct input."""
+    return Web3.to_checksum_address(address)
+
+
+def get_multicall(w3):
+    """Get the Multicall3 contract bound to w3."""
+    return w3.eth.contract(address=MULTICALL3_ADDRESS, abi=MULTICALL3_ABI)
+
+
+def encode_call(contract, fn_name, args, output_types=("uint256",)):
+    """Encode a contract read as a (target, calldata, output_types) call tuple."""
+    calldata = contract.encode_abi(fn_name, args=args)
+    return (contract.address, Web3.to_bytes(hexstr=calldata), list(output_types))
+
+
+def raw_call(target, fn_selector, arg_types, args, output_types=("uint256",)):
+    """Build a call tuple from a precomputed selector, skipping ABI/Contract dispatch."""
+    return (target, fn_selector + abi_encode(list(arg_types), list(args)), list(output_types))
+
+
+def eth_balance_call(owner):
+    """Native balance of owner, read through Multicall3.getEthBalance."""
+    return raw_call(MULTICALL3_ADDRESS, GET_ETH_BALANCE_SELECTOR, ["address"], [owner])
+
+
+def balance_of_call(token, owner):
+    """ERC20 balanceOf(owner) on token."""
+    return raw_call(token, BALANCE_OF_SELECTOR, ["address"], [owner])
+
+
+def allowance_call(token, owner, spender):
+    """ERC20 allowance(owner, spender) on token."""
+    return raw_call(token, ALLOWANCE_SELECTOR, ["address", "address"], [owner, spender])
+
+
+def multicall(w3, calls):
+    """Execute read-only calls in a single Multicall3 tryAggregate round-trip.
+
+    Args:
+        w3: Web3 instance
+        calls: List of (target, calldata, output_types) tuples (see encode_call)
+
+    Returns:
+        List of decoded results in call order. Single-output calls return the
+        bare value; failed calls return None.
+    """
+    aggregate = [(target, calldata) for target, calldata, _ in calls]
+    results = get_multicall(w3).functions.tryAggregate(False, aggregate).call()
+
+    decoded = []
+    for (_, _, output_types), (success, return_data) in zip(calls, results):
+        if not success or not return_data:
+            decoded.append(None)
+            continue
+        values = w3.codec.decode(output_types, return_data)
+        decoded.append(values[0] if len(values) == 1 else values)
+    return decoded
+
+
+def _single_call(w3, call):
+    """Execute one (target, calldata, output_types) call as a plain eth_call."""
+    target, calldata, output_types = call
+    
+    try:
+        # getEthBalance lives on Multicall3 itself - use eth_getBalance instead
+        if target == MULTICALL3_ADDRESS and calldata[:4] == GET_ETH_BALANCE_SELECTOR:
+            owner = w3.codec.decode(["address"], calldata[4:])[0]
+            return w3.eth.get_balance(owner)
+        
+        return_data = w3.eth.call({"to": target, "data": calldata})
+        values = w3.codec.decode(output_types, return_data)
+        return values[0] if len(values) == 1 else values
+    except Exception:
+        return None
+
+
+def parallel_calls(w3, calls):
+    """Execute calls as individual eth_calls issued concurrently.
+    
+    Same return format as multicall(). Used when Multicall3 is unavailable.
+    """
+    with ThreadPoolExecutor(max_workers=PARALLEL_WORKERS) as executor:
+        return list(executor.map(lambda call: _single_call(w3, call), calls))
+
+
+def batch_read(w3, calls):
+    """Execute read-only calls via Multicall3, falling back to parallel eth_calls."""
+    try:
+        return multicall(w3, calls)
+    except Exception:
+        return parallel_calls(w3, calls)
+
+
+def _mined_hashes(w3, tx_hashes):
+    """Return the subset of tx_hashes already included in a block, in one JSON-RPC batch.
+    
+    Uses eth_getTransactionByHash (a cheap lookup for most nodes) rather than
+    eth_getTransactionReceipt; the receipt is fetched once the TX is mined.
+    """
+    try:
+        responses = w3.provider.make_batch_request([
+            ("eth_getTransactionByHash", [Web3.to_hex(tx_hash)]) for tx_hash in tx_hashes
+        ])
+        return [
+            tx_hash for tx_hash, response in zip(tx_hashes, responses)
+            if (response.get("result") or {}).get("blockNumber") is not None
+        ]
+    except Exception:
+        # RPC rejects batches - check each hash on its own
+        mined = []
+        for tx_hash in tx_hashes:
+            try:
+                if w3.eth.get_transaction(tx_hash).get("blockNumber") is not None:
+                    mined.append(tx_hash)
+            except TransactionNotFound:
+                pass
+        return mined
+
+
+def wait_for_receipts(w3, tx_hashes, timeout=120):
+    """Wait for several TXs at once, fetching each receipt only once it is mined.
+    
+    Each poll is a single batched eth_getTransactionByHash for every
+    outstanding hash. Polls start at one block time and back off
+    exponentially up to RECEIPT_POLL_MAX, keeping load on public RPCs low.
+    
+    Returns:
+        dict: tx_hash -> receipt for every TX mined before the timeout
+    """
+    deadline = time.monotonic() + timeout
+    receipts = {}
+    outstanding = list(tx_hashes)
+    interval = RECEIPT_POLL_INTERVAL
+    
+    while outstanding:
+        for tx_hash in _mined_hashes(w3, outstanding):
+            receipts[tx_hash] = w3.eth.get_transaction_receipt(tx_hash)
+        outstanding = [tx_hash for tx_hash in outstanding if tx_hash not in receipts]
+        
+        remaining = deadline - time.monotonic()
+        if not outstanding or remaining <= 0:
+            break
+        time.sleep(min(interval, remaining))
+        interval = min(interval * 2, RECEIPT_POLL_MAX)
+    
+    return receipts
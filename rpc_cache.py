@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Small JSON disk cache for RPC read results.
+Lets repeated check_balance runs skip reads that rarely change (allowances).
+"""
+
+import os
+import json
+import time
+
+CACHE_FILE = os.path.join(os.path.dirname(__file__), "logs", "_rpc_cache.json")
+
+ALLOWANCE_TTL = 60  # seconds
+
+
+def allowance_key(wallet: str, token: str, spender: str) -> str:
+    """Cache key for an ERC20 allowance(wallet, spender) on token."""
+    return f"allowance:{wallet.lower()}:{token.lower()}:{spender.lower()}"
+
+
+def _load() -> dict:
+    try:
+        with open(CACHE_FILE) as f:
+            return json.load(f)
+    except Exception:
+        return {}
+
+
+def _save(cache: dict):
+    try:
+        os.makedirs(os.path.dirname(CACHE_FILE), exist_ok=True)
+        tmp_path = f"{CACHE_FILE}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(cache, f)
+        os.replace(tmp_path, CACHE_FILE)
+    except Exception:
+        pass  # Cache is best-effort
+
+
+def get(key: str, ttl: float = None):
+    """Get (value, age_seconds) for key, or None if missing or older than ttl.
+
+    ttl=None returns the entry regardless of age (for stale fallbacks).
+    """
+    entry = _load().get(key)
+    if entry is None:
+        return None
+    age = time.time() - entry["ts"]
+    if ttl is not None and age > ttl:
+        return None
+    return entry["value"], age
+
+
+def put_many(values: dict):
+    """Store {key: value} entries stamped with the current time."""
+    if not values:
+        return
+    cache = _load()
+    now = time.time()
+    for key, value in values.items():
+        cache[key] = {"value": value, "ts": now}
+    _save(cache)
+
+
+def invalidate(prefix: str = "allowance:"):
+    """Drop every entry whose key starts with prefix."""
+    cache = _load()
+    kept = {key: entry for key, entry in cache.items() if not key.startswith(prefix)}
+    if len(kept) != len(cache):
+        _save(kept)
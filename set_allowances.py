@@ -12,12 +12,14 @@ Usage:
 """
 
 import os
-import time
 from dotenv import load_dotenv
+from eth_abi import encode as abi_encode
 from web3 import Web3
-from web3.constants import MAX_INT
 from web3.middleware import ExtraDataToPOAMiddleware
 
+import rpc_cache
+from rpc import allowance_call, raw_call, batch_read, selector, wait_for_receipts, make_web3
+
 load_dotenv()
 
 PRIVATE_KEY = os.getenv("PRIVATE_KEY", "")
@@ -28,6 +30,13 @@ USDC_BRIDGED = "0x2791Bca1f2de4661ED88A30C99A7a9449Aa84174"  # Bridged USDC (mai
 USDC_NATIVE = "0x3c499c542cEF5E3811e1192ce70d8cC03d5c3359"   # USDC.e Native
 CTF_ADDRESS = "0x4D97DCd97eC945f40cF65F87097ACe5EA0476045"
 
+CHAIN_ID = 137  # Polygon
+
+GAS_PRICE_BUFFER = 1.1  # Headroom on the single gas price read shared by all approvals
+
+# Node errors meaning the shared gas price is too low to be accepted
+UNDERPRICED_ERRORS = ("underpriced", "fee too low")
+
 SPENDERS = [
     ("CTF Exchange", "0x4bFb41d5B3570DeFd03C39a9A4D8dE6Bd8B8982E"),
     ("Neg Risk CTF Exchange", "0xC5d563A36AE78145C45a50134d48A1215220f80a"),
@@ -39,9 +48,94 @@ USDC_TOKENS = [
     ("USDC.e (Native)", USDC_NATIVE),
 ]
 
-ERC20_ABI = """[{"constant": false,"inputs": [{"name": "_spender","type": "address" },{ "name": "_value", "type": "uint256" }],"name": "approve","outputs": [{ "name": "", "type": "bool" }],"payable": false,"stateMutability": "nonpayable","type": "function"}]"""
+MAX_UINT256 = (1 << 256) - 1  # Unlimited approve() amount
+UNLIMITED_ALLOWANCE = 10 ** 24  # Anything above this counts as already approved
+MIN_GAS_WEI = 10 ** 16  # 0.01 POL - warn below this
+
+IS_APPROVED_FOR_ALL_SELECTOR = selector("isApprovedForAll(address,address)")
+APPROVE_SELECTOR = selector("approve(address,uint256)")
+SET_APPROVAL_FOR_ALL_SELECTOR = selector("setApprovalForAll(address,bool)")
+
+# Approval calldata depends only on the spender - encode it once at import
+APPROVE_CALLDATA = {
+    spender: Web3.to_hex(APPROVE_SELECTOR + abi_encode(["address", "uint256"], [spender, MAX_UINT256]))
+    for _, spender in SPENDERS
+}
+OPERATOR_CALLDATA = {
+    spender: Web3.to_hex(SET_APPROVAL_FOR_ALL_SELECTOR + abi_encode(["address", "bool"], [spender, True]))
+    for _, spender in SPENDERS
+}
+
+def read_existing_approvals(web3, owner):
+    """Read every current USDC allowance and CTF operator approval in one batch.
+    
+    Approvals can't be merged into one transaction (approve/setApprovalForAll
+    authorize msg.sender, so an EOA has to send each one itself), but the ones
+    already in place can be skipped entirely.
+    
+    Returns:
+        set of (token_address, spender) pairs that need no new transaction
+    """
+    pairs = []
+    calls = []
+    for _, spender in SPENDERS:
+        for _, token_addr in USDC_TOKENS:
+            pairs.append((token_addr, spender))
+            calls.append(allowance_call(token_addr, owner, spender))
+        pairs.append((CTF_ADDRESS, spender))
+        calls.append(raw_call(CTF_ADDRESS, IS_APPROVED_FOR_ALL_SELECTOR, ["address", "address"],
+                              [owner, spender], output_types=("bool",)))
+    
+    try:
+        results = batch_read(web3, calls)
+    except Exception as e:
+        print(f"Could not read existing approvals ({e}), approving everything")
+        return set()
+    
+    approved = set()
+    for (token_addr, spender), value in zip(pairs, results):
+        if value is True or (value is not None and value > UNLIMITED_ALLOWANCE):
+            approved.add((token_addr, spender))
+    return approved
+
+
+def read_account_state(web3, pub_key):
+    """Get (POL balance, pending nonce, gas price) in one JSON-RPC batch.
+    
+    Falls back to sequential calls if the RPC rejects batch requests.
+    """
+    try:
+        with web3.batch_requests() as batch:
+            batch.add(web3.eth.get_balance(pub_key))
+            batch.add(web3.eth.get_transaction_count(pub_key, "pending"))
+            batch.add(web3.eth.gas_price)
+            balance, nonce, gas_price = batch.execute()
+    except Exception:
+        balance = web3.eth.get_balance(pub_key)
+        nonce = web3.eth.get_transaction_count(pub_key, "pending")
+        gas_price = web3.eth.gas_price
+    return balance, nonce, gas_price
+
+
+def send_approval(web3, pub_key, to, data, nonce, gas_price, gas):
+    """Sign and broadcast one approval TX at the given nonce (no receipt wait).
+    
+    The tx dict is assembled by hand from precomputed calldata, skipping
+    Contract.functions and build_transaction.
+    """
+    tx = {
+        "chainId": CHAIN_ID,
+        "from": pub_key,
+        "to": to,
+        "data": data,
+        "value": 0,
+        "nonce": nonce,
+        "gas": gas,
+        "gasPrice": gas_price,
+    }
+    signed_tx = web3.eth.account.sign_transaction(tx, private_key=PRIVATE_KEY)
+    return web3.eth.send_raw_transaction(signed_tx.raw_transaction)
 
-ERC1155_ABI = """[{"inputs": [{ "internalType": "address", "name": "operator", "type": "address" },{ "internalType": "bool", "name": "approved", "type": "bool" }],"name": "setApprovalForAll","outputs": [],"stateMutability": "nonpayable","type": "function"}]"""
 
 def main():
     if not PRIVATE_KEY or not PRIVATE_KEY.startswith("0x"):
@@ -50,7 +144,7 @@ def main():
     
     print(f"Using RPC: {RPC_URL}")  # Debug: confirm endpoint
     
-    web3 = Web3(Web3.HTTPProvider(RPC_URL))
+    web3 = make_web3(RPC_URL)  # Backs off only when the RPC rate-limits (429 / -32005)
     web3.middleware_onion.inject(ExtraDataToPOAMiddleware, layer=0)
     
     account = web3.eth.account.from_key(PRIVATE_KEY)
@@ -58,68 +152,66 @@ def main():
     
     print(f"Wallet: {pub_key}")
     
-    balance = web3.eth.get_balance(pub_key)
+    balance, nonce, base_gas_price = read_account_state(web3, pub_key)
     print(f"POL balance: {web3.from_wei(balance, 'ether')} POL")
     
-    if balance < web3.to_wei(0.01, "ether"):
+    if balance < MIN_GAS_WEI:
         print("WARNING: Low POL balance, you need gas for transactions")
     
-    time.sleep(0.5)  # Pause to avoid rate limits
-    
-    ctf = web3.eth.contract(address=CTF_ADDRESS, abi=ERC1155_ABI)
-    
-    chain_id = 137
-    
     print("\nSetting allowances for all USDC tokens and CTF...\n")
     
+    approved = read_existing_approvals(web3, pub_key)
+    
+    # Collect the approvals still missing
+    approvals = []  # (label, to, calldata, gas limit)
     for spender_name, spender in SPENDERS:
-        print(f"\n=== {spender_name} ===")
-        print(f"    Address: {spender}")
-        time.sleep(0.5)  # Pause between spenders
-        
-        # Approve all USDC tokens
         for token_name, token_addr in USDC_TOKENS:
-            try:
-                usdc = web3.eth.contract(address=token_addr, abi=ERC20_ABI)
-                nonce = web3.eth.get_transaction_count(pub_key)
-                
-                tx = usdc.functions.approve(spender, int(MAX_INT, 0)).build_transaction({
-                    "chainId": chain_id,
-                    "from": pub_key,
-                    "nonce": nonce,
-                    "gas": 500000,
-                    "gasPrice": web3.eth.gas_price,
-                })
-                signed_tx = web3.eth.account.sign_transaction(tx, private_key=PRIVATE_KEY)
-                tx_hash = web3.eth.send_raw_transaction(signed_tx.raw_transaction)
-                web3.eth.wait_for_transaction_receipt(tx_hash, timeout=120)
-                print(f"  {token_name} approved: {tx_hash.hex()}")
-                time.sleep(1)  # Pause between transactions
-                
-            except Exception as e:
-                print(f"  {token_name} error: {e}")
-                time.sleep(1)
+            if (token_addr, spender) in approved:
+                print(f"  {token_name} -> {spender_name}: already approved")
+                continue
+            approvals.append((f"{token_name} -> {spender_name}", token_addr, APPROVE_CALLDATA[spender], 500000))
         
-        # Approve CTF
+        if (CTF_ADDRESS, spender) in approved:
+            print(f"  CTF -> {spender_name}: already approved")
+            continue
+        approvals.append((f"CTF -> {spender_name}", CTF_ADDRESS, OPERATOR_CALLDATA[spender], 100000))
+    
+    # Nonce + gas price were read once up front; every approval is sent back-to-back
+    gas_price = int(base_gas_price * GAS_PRICE_BUFFER)
+    sent = []  # (label, tx_hash)
+    
+    for label, to, data, gas in approvals:
         try:
-            nonce = web3.eth.get_transaction_count(pub_key)
-            
-            tx = ctf.functions.setApprovalForAll(spender, True).build_transaction({
-                "chainId": chain_id,
-                "from": pub_key,
-                "nonce": nonce,
-                "gas": 100000,
-                "gasPrice": web3.eth.gas_price,
-            })
-            signed_tx = web3.eth.account.sign_transaction(tx, private_key=PRIVATE_KEY)
-            tx_hash = web3.eth.send_raw_transaction(signed_tx.raw_transaction)
-            web3.eth.wait_for_transaction_receipt(tx_hash, timeout=120)
-            print(f"  CTF approved: {tx_hash.hex()}")
-            time.sleep(1)  # Pause between transactions
-            
+            try:
+                tx_hash = send_approval(web3, pub_key, to, data, nonce, gas_price, gas)
+            except Exception as e:
+                if not any(msg in str(e).lower() for msg in UNDERPRICED_ERRORS):
+                    raise
+                # Fees moved since the single read - refresh and retry just this TX
+                gas_price = max(int(web3.eth.gas_price * GAS_PRICE_BUFFER), int(gas_price * GAS_PRICE_BUFFER))
+                print(f"  {label}: gas price too low, retrying at {gas_price}")
+                tx_hash = send_approval(web3, pub_key, to, data, nonce, gas_price, gas)
+            nonce += 1
+            sent.append((label, tx_hash))
+            print(f"  {label} sent: {tx_hash.hex()}")
         except Exception as e:
-            print(f"  CTF error: {e}")
-            time.sleep(1)
+            print(f"  {label} error: {e}")
+    
+    # Wait for every approval together instead of one block per transaction
+    if sent:
+        print(f"\nWaiting for {len(sent)} approval TX(s)...")
+        receipts = wait_for_receipts(web3, [tx_hash for _, tx_hash in sent])
+        for label, tx_hash in sent:
+            receipt = receipts.get(tx_hash)
+            if receipt is None:
+                print(f"  {label}: not confirmed yet ({tx_hash.hex()})")
+            elif receipt.get("status") == 1:
+                print(f"  {label} approved: {tx_hash.hex()}")
+            else:
+                print(f"  {label} FAILED: {tx_hash.hex()}")
+    
+    # Allowances changed - make check_balance re-read them
+    rpc_cache.invalidate("allowance:")
     
     print("\n" + "="*60)
     print("Done! All allowances set.")
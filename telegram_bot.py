@@ -5,7 +5,8 @@ Telegram Bot for Remote Trading Control
 Commands:
 - /status - Check system status (WS connections, current market)
 - /balance - Check wallet USDC balance
-- /redeemall - Collect all unredeemed winnings
+- /redeemall - List unredeemed winnings (asks for confirmation)
+- /redeemall_confirm - Redeem them (within 2 minutes of /redeemall)
 - /stop - Stop trade.py process
 - /restart - Restart trade.py process
 - /help - Show available commands
@@ -14,11 +15,18 @@ Run: python3 telegram_bot.py
 """
 
 import os
+import io
 import sys
 import time
 import signal
+import select
+import threading
+import importlib
 import subprocess
 import requests
+from requests.adapters import HTTPAdapter
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from contextlib import redirect_stdout
 from datetime import datetime
 from dotenv import load_dotenv
 
@@ -32,7 +40,15 @@ TELEGRAM_BOT_TOKEN = os.getenv("TELEGRAM_BOT_TOKEN", "")
 TELEGRAM_CHAT_ID = os.getenv("TELEGRAM_CHAT_ID", "")
 TRADE_PID_FILE = os.path.join(os.path.dirname(__file__), ".trade.pid")
 
-ALLOWED_CHAT_IDS = [TELEGRAM_CHAT_ID] if TELEGRAM_CHAT_ID else []
+ALLOWED_CHAT_IDS = frozenset([TELEGRAM_CHAT_ID]) if TELEGRAM_CHAT_ID else frozenset()
+
+COMMAND_WORKERS = 4  # Commands that may run at the same time
+CONNECT_TIMEOUT = 5  # seconds - fail fast when api.telegram.org is unreachable
+LONG_POLL_GRACE = 2  # seconds past the long-poll timeout before giving up on a read
+
+BALANCE_TIMEOUT = 30  # seconds
+REDEEMALL_TIMEOUT = 300  # seconds
+REDEEM_CONFIRM_WINDOW = 120  # seconds after /redeemall that /redeemall_confirm is accepted
 
 
 class TelegramBot:
@@ -44,10 +60,27 @@ class TelegramBot:
         self.last_update_id = 0
         self.running = True
         
+        # Keep-alive session: long polls and replies reuse one warm TLS connection
+        self.session = requests.Session()
+        self.session.mount("https://", HTTPAdapter(pool_connections=2, pool_maxsize=4))
+        
+        # Commands run off the polling thread, so a slow /redeemall or /stop
+        # doesn't stall /status; stop/restart are serialized by the lock
+        self.executor = ThreadPoolExecutor(max_workers=COMMAND_WORKERS, thread_name_prefix="tg-cmd")
+        self.process_lock = threading.RLock()
+        self.child_proc = None  # trade.py started by /restart (lets /stop wait on it directly)
+        
+        # In-process /balance runs on its own single worker: stdout capture is
+        # process-wide, and a slow RPC can't hold up the command workers
+        self.script_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="tg-script")
+        self.balance_future = None
+        self.redeem_confirm_until = {}  # chat_id -> monotonic deadline for /redeemall_confirm
+        
         self.commands = {
             "/status": self.cmd_status,
             "/balance": self.cmd_balance,
             "/redeemall": self.cmd_redeemall,
+            "/redeemall_confirm": self.cmd_redeemall_confirm,
             "/stop": self.cmd_stop,
             "/restart": self.cmd_restart,
             "/help": self.cmd_help,
@@ -58,11 +91,11 @@ class TelegramBot:
         """Send a message to a chat."""
         try:
             url = f"{self.base_url}/sendMessage"
-            requests.post(url, json={
+            self.session.post(url, json={
                 "chat_id": chat_id,
                 "text": text,
                 "parse_mode": "HTML"
-            }, timeout=10)
+            }, timeout=(CONNECT_TIMEOUT, 10))
         except Exception as e:
             logger.error(f"Failed to send message: {e}")
     
@@ -70,10 +103,10 @@ class TelegramBot:
         """Get updates from Telegram using long polling."""
         try:
             url = f"{self.base_url}/getUpdates"
-            response = requests.get(url, params={
+            response = self.session.get(url, params={
                 "offset": self.last_update_id + 1,
                 "timeout": timeout
-            }, timeout=timeout + 5)
+            }, timeout=(CONNECT_TIMEOUT, timeout + LONG_POLL_GRACE))
             
             data = response.json()
             if data.get("ok"):
@@ -93,7 +126,8 @@ class TelegramBot:
 
 /status - System status
 /balance - Wallet balance
-/redeemall - Collect winnings
+/redeemall - List winnings to collect
+/redeemall_confirm - Collect them
 /stop - Stop trading
 /restart - Restart trading
 /help - This message"""
@@ -126,60 +160,110 @@ Time remaining: {time_remaining}s"""
         
         self.send_message(chat_id, text)
     
+    def _run_in_process(self, module_name: str, func_name: str) -> str:
+        """Run module_name.func_name() on the script worker and return what it printed.
+        
+        The module is imported on first use, inside the capture, so its
+        import-time output and config exits land in the reply instead of the
+        bot's console; later calls reuse the loaded module.
+        """
+        buffer = io.StringIO()
+        with redirect_stdout(buffer):
+            try:
+                module = importlib.import_module(module_name)
+                getattr(module, func_name)()
+            except SystemExit:
+                pass  # Scripts exit on config errors - their message is in the output
+        return buffer.getvalue()
+    
+    def _run_subprocess(self, args: list, timeout: float) -> subprocess.CompletedProcess:
+        """Run a script as a child process with no stdin (killed on timeout)."""
+        return subprocess.run(
+            ["python3", *args],
+            cwd=os.path.dirname(__file__),
+            stdin=subprocess.DEVNULL,
+            capture_output=True,
+            text=True,
+            timeout=timeout
+        )
+    
+    def _tail_html(self, output: str) -> str:
+        """Last 1500 chars of script output, escaped for HTML parse mode."""
+        output = output[-1500:] if len(output) > 1500 else output
+        return output.replace("<", "&lt;").replace(">", "&gt;")
+    
     def cmd_balance(self, chat_id: str):
         """Check wallet balance."""
+        previous = self.balance_future
+        if previous is not None and not previous.done():
+            # Every RPC call in check_balance is bounded, so the old run ends on its own
+            self.send_message(chat_id, "Previous balance check still running, try again shortly")
+            return
+        
         self.send_message(chat_id, "Checking balance...")
         
         try:
-            result = subprocess.run(
-                ["python3", "check_balance.py"],
-                cwd=os.path.dirname(__file__),
-                capture_output=True,
-                text=True,
-                timeout=30
-            )
-            
-            output = result.stdout[-1500:] if len(result.stdout) > 1500 else result.stdout
-            output = output.replace("<", "&lt;").replace(">", "&gt;")
+            self.balance_future = self.script_executor.submit(self._run_in_process, "check_balance", "check_balance")
+            output = self.balance_future.result(timeout=BALANCE_TIMEOUT)
+            self.send_message(chat_id, f"<pre>{self._tail_html(output)}</pre>")
+        except FutureTimeout:
+            self.send_message(chat_id, "Timeout - balance check took too long")
+        except Exception as e:
+            logger.exception(f"Balance check failed: {e}")
+            self.send_message(chat_id, f"Error: {str(e)[:100]}")
+    
+    def cmd_redeemall(self, chat_id: str):
+        """List redeemable positions; redeeming needs /redeemall_confirm.
+        
+        Stays a subprocess (unlike /balance): it can sign and send transactions,
+        so a run that overstays its timeout must be killable.
+        """
+        self.send_message(chat_id, "Starting redeemall...")
+        
+        try:
+            # No stdin: the confirmation prompt sees EOF and cancels after listing
+            result = self._run_subprocess(["redeemall.py"], REDEEMALL_TIMEOUT)
             
             if result.returncode == 0:
-                self.send_message(chat_id, f"<pre>{output}</pre>")
+                self.send_message(chat_id, f"Redeemall complete:\n<pre>{self._tail_html(result.stdout)}</pre>")
+                self.redeem_confirm_until[chat_id] = time.monotonic() + REDEEM_CONFIRM_WINDOW
+                self.send_message(chat_id, f"Send /redeemall_confirm within {REDEEM_CONFIRM_WINDOW}s to redeem")
             else:
-                self.send_message(chat_id, f"Error:\n<pre>{result.stderr[:500]}</pre>")
+                self.send_message(chat_id, f"Redeemall error:\n<pre>{self._tail_html(result.stderr[:500])}</pre>")
                 
         except subprocess.TimeoutExpired:
-            self.send_message(chat_id, "Timeout - balance check took too long")
+            self.send_message(chat_id, "Timeout - redeemall took too long")
         except Exception as e:
             self.send_message(chat_id, f"Error: {str(e)[:100]}")
     
-    def cmd_redeemall(self, chat_id: str):
-        """Run redeemall.py to collect all winnings."""
-        self.send_message(chat_id, "Starting redeemall...")
+    def cmd_redeemall_confirm(self, chat_id: str):
+        """Redeem all positions, if /redeemall listed them moments ago."""
+        deadline = self.redeem_confirm_until.pop(chat_id, 0)
+        if time.monotonic() > deadline:
+            self.send_message(chat_id, "Nothing to confirm - send /redeemall first")
+            return
+        
+        self.send_message(chat_id, "Redeeming...")
         
         try:
-            result = subprocess.run(
-                ["python3", "redeemall.py"],
-                cwd=os.path.dirname(__file__),
-                capture_output=True,
-                text=True,
-                timeout=300
-            )
-            
-            output = result.stdout[-1500:] if len(result.stdout) > 1500 else result.stdout
-            output = output.replace("<", "&lt;").replace(">", "&gt;")
+            result = self._run_subprocess(["redeemall.py", "--auto-confirm"], REDEEMALL_TIMEOUT)
             
             if result.returncode == 0:
-                self.send_message(chat_id, f"Redeemall complete:\n<pre>{output}</pre>")
+                self.send_message(chat_id, f"Redeemall complete:\n<pre>{self._tail_html(result.stdout)}</pre>")
             else:
-                self.send_message(chat_id, f"Redeemall error:\n<pre>{result.stderr[:500]}</pre>")
+                self.send_message(chat_id, f"Redeemall error:\n<pre>{self._tail_html(result.stderr[:500])}</pre>")
                 
         except subprocess.TimeoutExpired:
-            self.send_message(chat_id, "Timeout - redeemall took too long")
+            self.send_message(chat_id, "Timeout - redeemall killed (sent TXs may still confirm)")
         except Exception as e:
             self.send_message(chat_id, f"Error: {str(e)[:100]}")
     
     def cmd_stop(self, chat_id: str) -> bool:
         """Stop trade.py process. Returns True if stopped."""
+        with self.process_lock:
+            return self._stop_trade(chat_id)
+    
+    def _stop_trade(self, chat_id: str) -> bool:
         pid = self._get_trade_pid()
         
         if not pid:
@@ -197,15 +281,13 @@ Time remaining: {time_remaining}s"""
             self.send_message(chat_id, f"STOP signal sent to trade.py (PID {pid})")
             logger.info(f"Sent SIGTERM to trade.py PID {pid}")
             
-            for i in range(10):
-                time.sleep(1)
-                if not self._is_process_running(pid):
-                    self.send_message(chat_id, "Trade.py stopped successfully")
-                    self._remove_pid_file()
-                    return True
+            if self._wait_for_exit(pid, timeout=10):
+                self.send_message(chat_id, "Trade.py stopped successfully")
+                self._remove_pid_file()
+                return True
             
             os.kill(pid, signal.SIGKILL)
-            time.sleep(1)
+            self._wait_for_exit(pid, timeout=1)
             self._remove_pid_file()
             self.send_message(chat_id, "Trade.py force killed (SIGKILL)")
             return True
@@ -223,7 +305,11 @@ Time remaining: {time_remaining}s"""
     
     def cmd_restart(self, chat_id: str):
         """Restart trade.py process."""
-        stopped = self.cmd_stop(chat_id)
+        with self.process_lock:
+            self._restart_trade(chat_id)
+    
+    def _restart_trade(self, chat_id: str):
+        stopped = self._stop_trade(chat_id)
         
         if not stopped:
             self.send_message(chat_id, "Cannot restart - stop failed")
@@ -242,6 +328,8 @@ Time remaining: {time_remaining}s"""
                 start_new_session=True
             )
             
+            self.child_proc = process
+            
             time.sleep(2)
             if self._is_process_running(process.pid):
                 self.send_message(chat_id, f"Trade.py started (PID {process.pid})")
@@ -270,6 +358,38 @@ Time remaining: {time_remaining}s"""
         except (ProcessLookupError, PermissionError):
             return False
     
+    def _wait_for_exit(self, pid: int, timeout: float) -> bool:
+        """Wait up to timeout seconds for pid to exit. Returns True once it has.
+        
+        Wakes the moment the process exits: via Popen.wait for a trade.py we
+        started, otherwise via a pidfd (Linux 5.3+). Falls back to polling.
+        """
+        child = self.child_proc
+        if child is not None and child.pid == pid:
+            try:
+                child.wait(timeout=timeout)
+                return True
+            except subprocess.TimeoutExpired:
+                return False
+        
+        try:
+            pidfd = os.pidfd_open(pid)
+        except ProcessLookupError:
+            return True
+        except (AttributeError, OSError):
+            deadline = time.monotonic() + timeout
+            while time.monotonic() < deadline:
+                if not self._is_process_running(pid):
+                    return True
+                time.sleep(0.2)
+            return not self._is_process_running(pid)
+        
+        try:
+            readable, _, _ = select.select([pidfd], [], [], timeout)
+            return bool(readable)
+        finally:
+            os.close(pidfd)
+    
     def _remove_pid_file(self):
         """Remove PID file."""
         try:
@@ -295,11 +415,15 @@ Time remaining: {time_remaining}s"""
         
         if command in self.commands:
             logger.info(f"Executing command: {command}")
-            try:
-                self.commands[command](chat_id)
-            except Exception as e:
-                logger.error(f"Command error: {e}")
-                self.send_message(chat_id, f"Command error: {str(e)[:100]}")
+            self.executor.submit(self._run_command, command, chat_id)
+    
+    def _run_command(self, command: str, chat_id: str):
+        """Run a command handler on a worker thread."""
+        try:
+            self.commands[command](chat_id)
+        except Exception as e:
+            logger.error(f"Command error: {e}")
+            self.send_message(chat_id, f"Command error: {str(e)[:100]}")
     
     def run(self):
         """Main polling loop."""
@@ -323,6 +447,8 @@ Time remaining: {time_remaining}s"""
                 logger.error(f"Polling error: {e}")
                 time.sleep(5)
         
+        self.executor.shutdown(wait=False)
+        self.script_executor.shutdown(wait=False)
         logger.info("Telegram bot stopped")
 
 
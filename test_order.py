@@ -6,12 +6,21 @@ import sys
 import time
 import json
 import requests
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 
+try:
+    import orjson  # Optional: faster parsing of Gamma API responses
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
 from py_clob_client.client import ClobClient
 from py_clob_client.clob_types import OrderArgs, OrderType
 from py_clob_client.order_builder.constants import BUY
 
+from clob_creds import get_api_creds, is_auth_error, refresh_api_creds
+
 load_dotenv()
 
 PRIVATE_KEY = os.getenv("PRIVATE_KEY", "")
@@ -22,42 +31,59 @@ HOST = "https://clob.polymarket.com"
 CHAIN_ID = 137
 GAMMA_API = "https://gamma-api.polymarket.com"
 
+_SESSION = requests.Session()  # Keep-alive to gamma-api shared by the slot probes
+
+def _probe_slot(slot):
+    """Return market info for the BTC 15-minute event at slot, or None if not tradable."""
+    slug = f"btc-updown-15m-{slot}"
+    try:
+        response = _SESSION.get(f"{GAMMA_API}/events?slug={slug}", timeout=10)
+        if response.status_code != 200:
+            return None
+        events = _json_loads(response.content)
+        if events and len(events) > 0:
+            event = events[0]
+            if event.get("active") and not event.get("closed"):
+                markets = event.get("markets", [])
+                for market in markets:
+                    if market.get("active") and not market.get("closed"):
+                        clob_token_ids = market.get("clobTokenIds", [])
+                        outcomes = market.get("outcomes", [])
+                        if isinstance(clob_token_ids, str):
+                            clob_token_ids = _json_loads(clob_token_ids)
+                        if isinstance(outcomes, str):
+                            outcomes = _json_loads(outcomes)
+                        if len(clob_token_ids) >= 2:
+                            up_index = outcomes.index("Up") if "Up" in outcomes else 0
+                            down_index = outcomes.index("Down") if "Down" in outcomes else 1
+                            return {
+                                "slug": slug,
+                                "up_token_id": clob_token_ids[up_index],
+                                "down_token_id": clob_token_ids[down_index],
+                                "neg_risk": market.get("negRisk", True),
+                            }
+    except Exception as e:
+        pass
+    return None
+
 def find_active_market():
-    """Find active BTC 15-minute market."""
+    """Find active BTC 15-minute market.
+    
+    The current, previous and next slots are probed concurrently (one RTT
+    instead of three); the first tradable one in that order wins.
+    """
     now = int(time.time())
     current_slot = (now // 900) * 900
     slots_to_try = [current_slot, current_slot - 900, current_slot + 900]
     
-    for slot in slots_to_try:
-        slug = f"btc-updown-15m-{slot}"
-        try:
-            response = requests.get(f"{GAMMA_API}/events?slug={slug}", timeout=10)
-            if response.status_code != 200:
-                continue
-            events = response.json()
-            if events and len(events) > 0:
-                event = events[0]
-                if event.get("active") and not event.get("closed"):
-                    markets = event.get("markets", [])
-                    for market in markets:
-                        if market.get("active") and not market.get("closed"):
-                            clob_token_ids = market.get("clobTokenIds", [])
-                            outcomes = market.get("outcomes", [])
-                            if isinstance(clob_token_ids, str):
-                                clob_token_ids = json.loads(clob_token_ids)
-                            if isinstance(outcomes, str):
-                                outcomes = json.loads(outcomes)
-                            if len(clob_token_ids) >= 2:
-                                up_index = outcomes.index("Up") if "Up" in outcomes else 0
-                                down_index = outcomes.index("Down") if "Down" in outcomes else 1
-                                return {
-                                    "slug": slug,
-                                    "up_token_id": clob_token_ids[up_index],
-                                    "down_token_id": clob_token_ids[down_index],
-                                    "neg_risk": market.get("negRisk", True),
-                                }
-        except Exception as e:
-            continue
+    with ThreadPoolExecutor(max_workers=len(slots_to_try)) as executor:
+        futures = [executor.submit(_probe_slot, slot) for slot in slots_to_try]
+        for future in futures:
+            market = future.result()
+            if market:
+                for other in futures:
+                    other.cancel()
+                return market
     return None
 
 def main():
@@ -92,8 +118,8 @@ def main():
         else:
             client = ClobClient(HOST, key=PRIVATE_KEY, chain_id=CHAIN_ID, signature_type=2, funder=FUNDER_ADDRESS)
         
-        print("Generating API credentials...")
-        creds = client.create_or_derive_api_creds()
+        print("Loading API credentials...")
+        creds = get_api_creds(client, SIGNATURE_TYPE)
         client.set_api_creds(creds)
         
         print(f"API Key: {creds.api_key[:20]}...")
@@ -121,7 +147,14 @@ def main():
         print(f"Order created successfully")
         
         print("\nPosting order (FOK)...")
-        result = client.post_order(signed_order, OrderType.FOK)
+        try:
+            result = client.post_order(signed_order, OrderType.FOK)
+        except Exception as e:
+            if not is_auth_error(e):
+                raise
+            print("Cached API credentials rejected, re-deriving...")
+            refresh_api_creds(client, SIGNATURE_TYPE)
+            result = client.post_order(signed_order, OrderType.FOK)
         
         print(f"\n=== RESULT ===")
         print(json.dumps(result, indent=2))
@@ -18,13 +18,32 @@ import os
 import sys
 import time
 import json
+import atexit
+import select
 import signal
+import logging
 import requests
 import threading
 import websocket
-from datetime import datetime
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
 from dotenv import load_dotenv
 
+try:
+    import orjson  # Optional: faster decoding of WebSocket and API messages
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+try:
+    import termios  # Unix raw-mode keyboard input
+    import tty
+    msvcrt = None
+except ImportError:
+    termios = tty = None
+    import msvcrt  # Windows console input
+
 from py_clob_client.client import ClobClient
 from py_clob_client.clob_types import OrderArgs, OrderType
 from py_clob_client.order_builder.constants import BUY
@@ -91,7 +110,6 @@ SELECTED_CRYPTO_SYMBOL = "btc/usd"
 
 def flush_stdin():
     """Flush any buffered input from stdin to prevent stale keypresses."""
-    import select
     try:
         while select.select([sys.stdin], [], [], 0)[0]:
             sys.stdin.read(1)
@@ -109,6 +127,18 @@ POLYMARKET_WS = "wss://ws-subscriptions-clob.polymarket.com/ws/market"
 POLYMARKET_USER_WS = "wss://ws-subscriptions-clob.polymarket.com/ws/user"
 RTDS_WS = "wss://ws-live-data.polymarket.com"  # Polymarket RTDS for Chainlink prices
 
+# Optional WebSocket thread tuning (Linux): pin readers to cores, e.g. WS_CPUS=2,3,
+# and/or run them SCHED_FIFO at WS_RT_PRIORITY (1-99, needs CAP_SYS_NICE)
+WS_CPUS = {int(cpu) for cpu in os.getenv("WS_CPUS", "").split(",") if cpu.strip()}
+WS_RT_PRIORITY = int(os.getenv("WS_RT_PRIORITY", "0"))
+
+RPC_URL = os.getenv("RPC_URL", "https://polygon-mainnet.g.alchemy.com/v2/IZ9LcPHnEBGEAQxYrTZkk")
+
+# Keep-alive session for every REST call (CLOB, Gamma, Data API, CoinGecko, and
+# py-clob-client's own requests - see _pool_clob_http)
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=8))
+
 # Chainlink BTC/USD on Polygon
 CHAINLINK_BTC_USD = "0xc907E116054Ad103354f2D350FD2514433D57F6f"
 CHAINLINK_ABI = [
@@ -120,10 +150,13 @@ CHAINLINK_ABI = [
 # USDC contracts on Polygon
 USDC_BRIDGED = "0x2791Bca1f2de4661ED88A30C99A7a9449Aa84174"  # USDC.e (PoS bridged)
 USDC_NATIVE = "0x3c499c542cEF5E3811e1192ce70d8cC03d5c3359"   # Native USDC
-ERC20_ABI = [
-    {'constant': True, 'inputs': [{'name': '_owner', 'type': 'address'}], 'name': 'balanceOf', 'outputs': [{'name': 'balance', 'type': 'uint256'}], 'type': 'function'},
-    {'constant': True, 'inputs': [], 'name': 'decimals', 'outputs': [{'name': '', 'type': 'uint8'}], 'type': 'function'}
-]
+USDC_DECIMALS = 6  # Both USDC contracts
+
+# Conditional Tokens (outcome token balances)
+CTF_ADDRESS = "0x4D97DCd97eC945f40cF65F87097ACe5EA0476045"
+CTF_BALANCE_ABI = [{"inputs": [{"name": "_owner", "type": "address"}, {"name": "_id", "type": "uint256"}], 
+                    "name": "balanceOf", "outputs": [{"name": "", "type": "uint256"}], 
+                    "stateMutability": "view", "type": "function"}]
 
 
 class BalanceState:
@@ -140,10 +173,35 @@ balance_state = BalanceState()
 
 # Global state for real-time prices
 PRICE_STALE_THRESHOLD = 5.0  # seconds
+PRICE_TICKS = 1000  # Book prices are multiples of 0.001
+DASHBOARD_REFRESH = 1.0  # seconds - redraw at least this often for the countdown
+DASHBOARD_MIN_INTERVAL = 0.2  # seconds - coalesce bursts of ticks into one redraw
+FEED_READY_TIMEOUT = 5.0  # seconds to wait for the first orderbook at startup
 
 shutdown_requested = False
 feed_manager = None
 binance_ws = None
+user_ws = None
+
+
+def close_ws_feeds():
+    """Stop the market feed and close the Chainlink and User Channel sockets.
+    
+    Their reconnect loops check shutdown_requested, so once it is set each
+    WS thread exits as soon as its socket closes.
+    """
+    if feed_manager:
+        try:
+            feed_manager.stop()
+        except Exception:
+            pass
+    
+    for ws in (binance_ws, user_ws):
+        if ws:
+            try:
+                ws.close()
+            except Exception:
+                pass
 
 
 def signal_handler(signum, frame):
@@ -153,23 +211,82 @@ def signal_handler(signum, frame):
     logger.info(f"Received signal {signum}, shutting down...")
     add_message("Shutdown signal received", "warn")
     
-    if feed_manager:
-        try:
-            feed_manager.stop()
-        except:
-            pass
-    
-    if binance_ws:
-        try:
-            binance_ws.close()
-        except:
-            pass
+    close_ws_feeds()
 
 
 signal.signal(signal.SIGTERM, signal_handler)
 signal.signal(signal.SIGINT, signal_handler)
 
 
+@lru_cache(maxsize=1)
+def _polygon_web3():
+    """Shared Polygon Web3 on a pooled keep-alive session (rpc.make_web3)."""
+    from rpc import make_web3
+    return make_web3(RPC_URL)
+
+
+@lru_cache(maxsize=1)
+def _signer_address():
+    """EOA address for PRIVATE_KEY (derived once - secp256k1 key derivation isn't free)."""
+    from eth_account import Account
+    return Account.from_key(PRIVATE_KEY).address
+
+
+@lru_cache(maxsize=1)
+def _ctf_contract():
+    """CTF contract bound to the shared Web3 (ABI parsed once)."""
+    from web3 import Web3
+    return _polygon_web3().eth.contract(address=Web3.to_checksum_address(CTF_ADDRESS), abi=CTF_BALANCE_ABI)
+
+
+def _pool_clob_http():
+    """Route py-clob-client's HTTP calls through the keep-alive _SESSION.
+    
+    Older py-clob-client releases call requests.request() per API call, a
+    fresh TCP+TLS handshake every time. Newer ones keep their own pooled
+    client (_http_client) and are left alone.
+    """
+    try:
+        from py_clob_client.http_helpers import helpers
+    except ImportError:
+        return
+    if hasattr(helpers, "_http_client") or getattr(helpers, "requests", None) is not requests:
+        return
+    helpers.requests = _PooledRequests(_SESSION)
+
+
+class _PooledRequests:
+    """Stand-in for the requests module: request() uses a session, the rest is requests."""
+    
+    def __init__(self, session):
+        self._session = session
+    
+    def request(self, *args, **kwargs):
+        return self._session.request(*args, **kwargs)
+    
+    def __getattr__(self, name):
+        return getattr(requests, name)
+
+
+def tune_ws_thread(name):
+    """Apply WS_CPUS / WS_RT_PRIORITY to the calling WebSocket thread (no-op when unset)."""
+    if WS_CPUS and hasattr(os, "sched_setaffinity"):
+        try:
+            os.sched_setaffinity(0, WS_CPUS)
+            logger.info(f"{name} pinned to CPUs {sorted(WS_CPUS)}")
+        except OSError as e:
+            logger.warning(f"{name} CPU pinning failed: {e}")
+    
+    if WS_RT_PRIORITY > 0 and hasattr(os, "sched_setscheduler"):
+        try:
+            os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(WS_RT_PRIORITY))
+            logger.info(f"{name} running SCHED_FIFO priority {WS_RT_PRIORITY}")
+        except PermissionError:
+            logger.info(f"{name}: no RT priority (needs CAP_SYS_NICE), using default scheduler")
+        except OSError as e:
+            logger.warning(f"{name} SCHED_FIFO failed: {e}")
+
+
 def get_chainlink_btc_at_timestamp(target_timestamp):
     """Get Chainlink BTC/USD price at specific timestamp.
     
@@ -184,8 +301,7 @@ def get_chainlink_btc_at_timestamp(target_timestamp):
     try:
         from web3 import Web3
         
-        rpc_url = os.getenv("RPC_URL", "https://polygon-mainnet.g.alchemy.com/v2/IZ9LcPHnEBGEAQxYrTZkk")
-        w3 = Web3(Web3.HTTPProvider(rpc_url, request_kwargs={'timeout': 10}))
+        w3 = _polygon_web3()
         
         if not w3.is_connected():
             logger.warning("Chainlink query failed: cannot connect to RPC")
@@ -219,8 +335,8 @@ def get_chainlink_btc_at_timestamp(target_timestamp):
                     low = mid + 1
                 else:
                     high = mid - 1
-            except:
-                break
+            except Exception:
+                break  # Round missing or RPC error - use the best round so far
         
         # Get price at best round
         _, answer, _, round_time, _ = feed.functions.getRoundData(best_round).call()
@@ -244,8 +360,7 @@ def get_wallet_usdc_balance(wallet_address=None):
         Total USDC balance as float, or None if failed
     """
     try:
-        from web3 import Web3
-        from eth_account import Account
+        from rpc import batch_read, balance_of_call, eth_balance_call, checksum
         
         # Get wallet address based on SIGNATURE_TYPE
         if not wallet_address:
@@ -256,7 +371,7 @@ def get_wallet_usdc_balance(wallet_address=None):
             # Type 0: Use address from PRIVATE_KEY (EOA)
             # Type 1/2: Use FUNDER_ADDRESS (Proxy wallet)
             if SIGNATURE_TYPE == 0:
-                wallet_address = Account.from_key(pk).address
+                wallet_address = _signer_address()
             else:
                 if not FUNDER_ADDRESS:
                     logger.error(f"SIGNATURE_TYPE={SIGNATURE_TYPE} requires FUNDER_ADDRESS")
@@ -265,38 +380,31 @@ def get_wallet_usdc_balance(wallet_address=None):
         
         balance_state.wallet_address = wallet_address
         
-        rpc_url = os.getenv("RPC_URL", "https://polygon-mainnet.g.alchemy.com/v2/IZ9LcPHnEBGEAQxYrTZkk")
-        w3 = Web3(Web3.HTTPProvider(rpc_url, request_kwargs={'timeout': 10}))
-        
-        if not w3.is_connected():
-            logger.warning("Balance query failed: cannot connect to RPC")
+        w3 = _polygon_web3()
+        checksum_wallet = checksum(wallet_address)
+        
+        # USDC.e (bridged), native USDC and POL in one Multicall3 round-trip
+        # (no is_connected() probe - an unreachable RPC shows up as failed reads)
+        balance_e, balance_n, native_wei = batch_read(w3, [
+            balance_of_call(USDC_BRIDGED, checksum_wallet),
+            balance_of_call(USDC_NATIVE, checksum_wallet),
+            eth_balance_call(checksum_wallet),
+        ])
+        if balance_e is None or balance_n is None or native_wei is None:
+            logger.warning("Balance query failed: RPC read error")
             return None
         
-        total = 0.0
-        
-        # USDC.e (bridged) - main Polymarket token
-        usdc_e = w3.eth.contract(address=Web3.to_checksum_address(USDC_BRIDGED), abi=ERC20_ABI)
-        checksum_wallet = Web3.to_checksum_address(wallet_address)
-        balance_e = usdc_e.functions.balanceOf(checksum_wallet).call()
-        decimals_e = usdc_e.functions.decimals().call()
-        total += balance_e / (10 ** decimals_e)
-        
-        # Native USDC
-        usdc_n = w3.eth.contract(address=Web3.to_checksum_address(USDC_NATIVE), abi=ERC20_ABI)
-        balance_n = usdc_n.functions.balanceOf(checksum_wallet).call()
-        decimals_n = usdc_n.functions.decimals().call()
-        total += balance_n / (10 ** decimals_n)
+        total = (balance_e + balance_n) / (10 ** USDC_DECIMALS)
         
         # POL/MATIC native token - convert to USD
-        native_balance = w3.eth.get_balance(checksum_wallet) / (10 ** 18)
+        native_balance = native_wei / (10 ** 18)
         pol_price_usd = 0.10  # fallback
         try:
-            import requests
-            r = requests.get('https://api.coingecko.com/api/v3/simple/price?ids=polygon-ecosystem-token&vs_currencies=usd', timeout=3)
+            r = _SESSION.get('https://api.coingecko.com/api/v3/simple/price?ids=polygon-ecosystem-token&vs_currencies=usd', timeout=3)
             if r.status_code == 200:
                 pol_price_usd = r.json().get('polygon-ecosystem-token', {}).get('usd', 0.10)
-        except:
-            pass
+        except (requests.RequestException, ValueError, AttributeError):
+            pass  # Keep the fallback price
         total += native_balance * pol_price_usd
         
         balance_state.current_balance = total
@@ -328,11 +436,9 @@ token_balance_state = TokenBalanceState()
 def get_token_balances_from_api(condition_id):
     """Get token positions from Polymarket Data API with full details."""
     try:
-        from eth_account import Account
-        
         # Get wallet address based on SIGNATURE_TYPE
         if SIGNATURE_TYPE == 0:
-            wallet = Account.from_key(PRIVATE_KEY).address
+            wallet = _signer_address()
         else:
             if not FUNDER_ADDRESS:
                 logger.error(f"SIGNATURE_TYPE={SIGNATURE_TYPE} requires FUNDER_ADDRESS")
@@ -340,7 +446,7 @@ def get_token_balances_from_api(condition_id):
             wallet = FUNDER_ADDRESS
         
         # Call Data API
-        resp = requests.get(
+        resp = _SESSION.get(
             "https://data-api.polymarket.com/positions",
             params={
                 "user": wallet,
@@ -354,7 +460,7 @@ def get_token_balances_from_api(condition_id):
             logger.warning(f"Data API returned {resp.status_code}")
             return False
         
-        positions = resp.json()
+        positions = _json_loads(resp.content)
         
         # Reset state
         token_balance_state.up_balance = 0.0
@@ -435,16 +541,28 @@ def refresh_all_balances(market_data):
 
 
 class PriceState:
-    btc_price = 0.0
-    up_ask = 0.0
-    down_ask = 0.0
-    up_bid = 0.0
-    down_bid = 0.0
-    last_update = 0
-    last_binance_update = 0
-    last_polymarket_update = 0
-    ws_connected = False
-    warmup_complete = False  # Set True once BOTH feeds have reported
+    """Latest prices, written by the feed threads and read by the main loop.
+    
+    Fixed slots instead of a per-instance __dict__: every WS message stores
+    into these fields, and every redraw reads them.
+    """
+    __slots__ = (
+        "btc_price", "up_ask", "down_ask", "up_bid", "down_bid",
+        "last_update", "last_binance_update", "last_polymarket_update",
+        "ws_connected", "warmup_complete",
+    )
+    
+    def __init__(self):
+        self.btc_price = 0.0
+        self.up_ask = 0.0
+        self.down_ask = 0.0
+        self.up_bid = 0.0
+        self.down_bid = 0.0
+        self.last_update = 0
+        self.last_binance_update = 0
+        self.last_polymarket_update = 0
+        self.ws_connected = False
+        self.warmup_complete = False  # Set True once BOTH feeds have reported
     
     def check_warmup(self) -> bool:
         """Check if both feeds have reported at least once.
@@ -517,6 +635,47 @@ class PriceState:
 
 
 price_state = PriceState()
+price_tick = threading.Event()  # Set by the feeds on every price update; main loop redraws on it
+
+# Self-pipe so a price tick wakes the main loop out of its stdin select()
+if termios is not None:
+    _wake_r, _wake_w = os.pipe()
+    os.set_blocking(_wake_w, False)
+else:
+    _wake_r = _wake_w = None
+
+
+def notify_price_tick():
+    """Flag a price update and wake the main loop (one pipe write per redraw, not per tick)."""
+    if price_tick.is_set():
+        return
+    price_tick.set()
+    if _wake_w is not None:
+        try:
+            os.write(_wake_w, b"\0")
+        except BlockingIOError:
+            pass  # Pipe already holds a wakeup
+
+
+def _best_level(levels, best):
+    """Best price among orderbook levels (best=min for asks, max for bids), or 0.0.
+    
+    Levels may be {"price": ...} dicts, [price, size] lists or bare prices.
+    """
+    prices = []
+    for level in levels or ():
+        try:
+            if isinstance(level, dict):
+                price = float(level.get("price", 0))
+            elif isinstance(level, list):
+                price = float(level[0])
+            else:
+                price = float(level)
+        except (ValueError, IndexError, TypeError):
+            continue
+        if price > 0:
+            prices.append(price)
+    return best(prices) if prices else 0.0
 
 
 # WebSocket Feed Manager for proper lifecycle management
@@ -529,71 +688,28 @@ class PolymarketFeedManager:
         self.stop_event = threading.Event()
         self.thread = None
         self.running = False
+        self.snapshot_ready = threading.Event()  # Set once a book for the current tokens arrives
     
     def start(self, up_token, down_token):
         """Start WebSocket feed for given tokens."""
         self.tokens = {"up": up_token, "down": down_token}
         self.stop_event.clear()
+        self.snapshot_ready.clear()
         self.running = True
         
         def on_message(ws, message):
             if self.stop_event.is_set():
                 return
             try:
-                data = json.loads(message)
+                data = _json_loads(message)
                 event_type = data.get("event_type", "")
                 asset_id = data.get("asset_id", "")
+                top_before = (price_state.up_ask, price_state.down_ask, price_state.up_bid, price_state.down_bid)
                 
                 # Handle book updates (full orderbook)
                 if event_type == "book":
-                    asks = data.get("asks", [])
-                    bids = data.get("bids", [])
-                    
-                    if asks and len(asks) > 0:
-                        ask_prices = []
-                        for ask in asks:
-                            try:
-                                if isinstance(ask, dict):
-                                    price = float(ask.get("price", 0))
-                                elif isinstance(ask, list):
-                                    price = float(ask[0])
-                                else:
-                                    price = float(ask)
-                                if price > 0:
-                                    ask_prices.append(price)
-                            except (ValueError, IndexError):
-                                continue
-                        
-                        if ask_prices:
-                            best_ask = min(ask_prices)
-                            
-                            if asset_id == self.tokens["up"]:
-                                price_state.up_ask = best_ask
-                            elif asset_id == self.tokens["down"]:
-                                price_state.down_ask = best_ask
-                    
-                    if bids and len(bids) > 0:
-                        bid_prices = []
-                        for bid in bids:
-                            try:
-                                if isinstance(bid, dict):
-                                    price = float(bid.get("price", 0))
-                                elif isinstance(bid, list):
-                                    price = float(bid[0])
-                                else:
-                                    price = float(bid)
-                                if price > 0:
-                                    bid_prices.append(price)
-                            except (ValueError, IndexError):
-                                continue
-                        
-                        if bid_prices:
-                            best_bid = max(bid_prices)
-                            
-                            if asset_id == self.tokens["up"]:
-                                price_state.up_bid = best_bid
-                            elif asset_id == self.tokens["down"]:
-                                price_state.down_bid = best_bid
+                    self._apply_book(asset_id, data)
+                    self.snapshot_ready.set()
                 
                 # Handle price_change events (new format with price_changes array)
                 elif event_type == "price_change":
@@ -639,6 +755,10 @@ class PolymarketFeedManager:
                 price_state.last_polymarket_update = time.time()
                 price_state.last_update = time.time()  # Keep for backwards compat
                 
+                # Most updates are deeper in the book - only redraw when the top moved
+                if (price_state.up_ask, price_state.down_ask, price_state.up_bid, price_state.down_bid) != top_before:
+                    notify_price_tick()
+                
             except Exception as e:
                 logger.debug(f"WS message parse error: {e}")
         
@@ -664,6 +784,7 @@ class PolymarketFeedManager:
             logger.info(f"Subscribed to DOWN: {self.tokens['down'][:30]}...")
         
         def run_ws():
+            tune_ws_thread("Polymarket WS")
             while not self.stop_event.is_set():
                 try:
                     self.ws_app = websocket.WebSocketApp(
@@ -689,29 +810,52 @@ class PolymarketFeedManager:
         # Fetch initial prices via REST
         self._fetch_initial_prices()
     
+    def _apply_book(self, asset_id, book, only_missing=False):
+        """Update best bid/ask for asset_id from a full orderbook.
+        
+        Args:
+            asset_id: Token the book belongs to
+            book: Book dict with "asks"/"bids" levels
+            only_missing: Only fill prices still unset (REST seed must not
+                overwrite fresher WebSocket data)
+        """
+        if asset_id == self.tokens["up"]:
+            ask_field, bid_field = "up_ask", "up_bid"
+        elif asset_id == self.tokens["down"]:
+            ask_field, bid_field = "down_ask", "down_bid"
+        else:
+            return
+        
+        best_ask = _best_level(book.get("asks"), min)
+        best_bid = _best_level(book.get("bids"), max)
+        
+        if best_ask and not (only_missing and getattr(price_state, ask_field)):
+            setattr(price_state, ask_field, best_ask)
+        if best_bid and not (only_missing and getattr(price_state, bid_field)):
+            setattr(price_state, bid_field, best_bid)
+    
     def _fetch_initial_prices(self):
-        """Fetch initial prices from REST API."""
-        try:
-            resp = requests.get(f"https://clob.polymarket.com/book?token_id={self.tokens['up']}", timeout=5)
-            if resp.status_code == 200:
-                data = resp.json()
-                asks = data.get("asks", [])
-                if asks:
-                    price_state.up_ask = float(asks[0].get("price", 0))
-                    logger.info(f"Initial UP ask: {price_state.up_ask}")
-        except Exception as e:
-            logger.debug(f"Failed to fetch UP price: {e}")
+        """Seed prices for both tokens from one REST /books request.
         
+        Only fills sides the WebSocket hasn't reported yet.
+        """
         try:
-            resp = requests.get(f"https://clob.polymarket.com/book?token_id={self.tokens['down']}", timeout=5)
-            if resp.status_code == 200:
-                data = resp.json()
-                asks = data.get("asks", [])
-                if asks:
-                    price_state.down_ask = float(asks[0].get("price", 0))
-                    logger.info(f"Initial DOWN ask: {price_state.down_ask}")
+            resp = _SESSION.post(
+                f"{HOST}/books",
+                json=[{"token_id": self.tokens["up"]}, {"token_id": self.tokens["down"]}],
+                timeout=5
+            )
+            if resp.status_code != 200:
+                logger.debug(f"Initial books returned {resp.status_code}")
+                return
+            
+            for book in _json_loads(resp.content):
+                self._apply_book(book.get("asset_id", ""), book, only_missing=True)
+            
+            logger.info(f"Initial asks: UP={price_state.up_ask} DOWN={price_state.down_ask}")
+            self.snapshot_ready.set()
         except Exception as e:
-            logger.debug(f"Failed to fetch DOWN price: {e}")
+            logger.debug(f"Failed to fetch initial books: {e}")
     
     def switch_market(self, up_token, down_token):
         """Switch to new market - close old WS and start new."""
@@ -724,9 +868,6 @@ class PolymarketFeedManager:
         price_state.up_bid = 0.0
         price_state.down_bid = 0.0
         
-        # Wait briefly for old thread to terminate
-        time.sleep(0.5)
-        
         logger.info(f"Starting new WebSocket for market...")
         self.start(up_token, down_token)
     
@@ -758,6 +899,7 @@ feed_manager = polymarket_feed  # Assign to global for signal handler
 class PositionTracker:
     def __init__(self):
         self.open_positions = []  # List of open trades
+        self.positions_by_order = {}  # CLOB order ID -> open position (User WS lookups)
         self.closed_trades = []   # List of completed trades
         self.session_trades = 0   # Total trades this session
         self.session_wins = 0     # Winning trades
@@ -809,6 +951,8 @@ class PositionTracker:
         
         with self._lock:
             self.open_positions.append(position)
+            if trade_id:
+                self.positions_by_order[trade_id] = position
             self.session_trades += 1
             
             # Accumulate for average calculation
@@ -827,6 +971,7 @@ class PositionTracker:
         with self._lock:
             if position in self.open_positions:
                 self.open_positions.remove(position)
+                self.positions_by_order.pop(position.get("trade_id"), None)
                 self.session_trades -= 1
                 
                 # Reverse the accumulator using stored values
@@ -976,9 +1121,12 @@ class PositionTracker:
                 "unpaired_risk": unpaired_risk
             }
     
-    def get_buy_recommendation(self, current_up_ask, current_down_ask):
+    def get_buy_recommendation(self, current_up_ask, current_down_ask, analysis=None):
         """Get recommendation for completing paired position.
         
+        Pass analysis (from get_paired_analysis) to reuse an existing result
+        instead of recomputing it under the lock.
+        
         Returns dict with:
         - side: Which side to buy ('UP' or 'DOWN')
         - contracts: How many to buy to complete pairs
@@ -986,7 +1134,8 @@ class PositionTracker:
         - combined_price: avg existing + current ask
         - color: 'green' (< 0.98), 'yellow' (0.98-1.00), 'red' (> 1.00)
         """
-        analysis = self.get_paired_analysis()
+        if analysis is None:
+            analysis = self.get_paired_analysis()
         
         if analysis["unpaired_up"] > 0 and current_down_ask > 0:
             combined = analysis["avg_up"] + current_down_ask
@@ -1059,6 +1208,7 @@ class PositionTracker:
                 closed = {**pos, "profit": profit, "won": won}
                 self.closed_trades.append(closed)
                 self.open_positions.remove(pos)
+                self.positions_by_order.pop(pos.get("trade_id"), None)
                 
                 logger.info(f"Position closed: {pos['side']} P/L: ${profit:.2f}")
                 return closed
@@ -1100,6 +1250,7 @@ class PositionTracker:
                 }
                 self.closed_trades.append(closed)
                 self.open_positions.remove(pos)
+                self.positions_by_order.pop(pos.get("trade_id"), None)
                 
                 total_profit += profit
                 if profit > 0:
@@ -1188,7 +1339,14 @@ class PositionTracker:
         logger.info(f"Market tokens set, accumulators reset for: {market_id[:20] if market_id else 'N/A'}... (new_market={is_new_market})")
     
     def set_start_btc_price(self, price):
-        """Set the starting BTC price for deviation tracking."""
+        """Set the starting BTC price for deviation tracking.
+        
+        Called on every Chainlink tick. Once the price is fixed this returns
+        on a plain attribute read, without taking the lock; the locked check
+        below still decides the race for the first write.
+        """
+        if self.start_btc_price != 0.0 or price <= 0:
+            return
         with self._lock:
             if self.start_btc_price == 0.0 and price > 0:
                 self.start_btc_price = price
@@ -1238,14 +1396,62 @@ def validate_config():
         print_status("FUNDER_ADDRESS is required for signature types 1 and 2", "error")
         sys.exit(1)
     
-    from eth_account import Account
-    wallet = Account.from_key(PRIVATE_KEY)
-    logger.info(f"Wallet: {wallet.address}, SigType: {SIGNATURE_TYPE}, Size: ${TRADE_SIZE_USDC}")
+    logger.info(f"Wallet: {_signer_address()}, SigType: {SIGNATURE_TYPE}, Size: ${TRADE_SIZE_USDC}")
+
+
+def _probe_slot(crypto_slug, slot):
+    """Return market data for the 15-minute event at slot, or None if not tradable."""
+    slug = f"{crypto_slug}-updown-15m-{slot}"
+    logger.debug(f"Trying slot: {slug}")
+    
+    try:
+        response = _SESSION.get(f"{GAMMA_API}/events?slug={slug}", timeout=10)
+        if response.status_code != 200:
+            return None
+        
+        events = _json_loads(response.content)
+        if events and len(events) > 0:
+            event = events[0]
+            if event.get("active") and not event.get("closed"):
+                markets = event.get("markets", [])
+                
+                for market in markets:
+                    if market.get("active") and not market.get("closed"):
+                        clob_token_ids = market.get("clobTokenIds", [])
+                        outcomes = market.get("outcomes", [])
+                        
+                        if isinstance(clob_token_ids, str):
+                            clob_token_ids = _json_loads(clob_token_ids)
+                        if isinstance(outcomes, str):
+                            outcomes = _json_loads(outcomes)
+                        
+                        if len(clob_token_ids) >= 2:
+                            up_index = outcomes.index("Up") if "Up" in outcomes else 0
+                            down_index = outcomes.index("Down") if "Down" in outcomes else 1
+                            
+                            market_end_time = (slot + 900) * 1000
+                            
+                            return {
+                                "slug": slug,
+                                "question": market.get("question", event.get("title", slug)),
+                                "condition_id": market.get("conditionId"),
+                                "up_token_id": clob_token_ids[up_index],
+                                "down_token_id": clob_token_ids[down_index],
+                                "end_time": market_end_time,
+                                "neg_risk": market.get("negRisk", True),
+                            }
+    except Exception as e:
+        logger.debug(f"Error checking {slug}: {e}")
+    return None
 
 
 def find_active_market(crypto_slug="btc"):
     """Find active 15-minute market for specified cryptocurrency.
     
+    The current, previous and next slots are probed concurrently (one RTT
+    instead of up to three on every market switch); the first tradable one
+    in that order wins.
+    
     Args:
         crypto_slug: Crypto identifier for market slug (e.g., "btc", "eth", "sol", "xrp")
     
@@ -1256,50 +1462,15 @@ def find_active_market(crypto_slug="btc"):
     current_slot = (now // 900) * 900
     slots_to_try = [current_slot, current_slot - 900, current_slot + 900]
     
-    for slot in slots_to_try:
-        slug = f"{crypto_slug}-updown-15m-{slot}"
-        logger.debug(f"Trying slot: {slug}")
-        
-        try:
-            response = requests.get(f"{GAMMA_API}/events?slug={slug}", timeout=10)
-            if response.status_code != 200:
-                continue
-            
-            events = response.json()
-            if events and len(events) > 0:
-                event = events[0]
-                if event.get("active") and not event.get("closed"):
-                    markets = event.get("markets", [])
-                    
-                    for market in markets:
-                        if market.get("active") and not market.get("closed"):
-                            clob_token_ids = market.get("clobTokenIds", [])
-                            outcomes = market.get("outcomes", [])
-                            
-                            if isinstance(clob_token_ids, str):
-                                clob_token_ids = json.loads(clob_token_ids)
-                            if isinstance(outcomes, str):
-                                outcomes = json.loads(outcomes)
-                            
-                            if len(clob_token_ids) >= 2:
-                                up_index = outcomes.index("Up") if "Up" in outcomes else 0
-                                down_index = outcomes.index("Down") if "Down" in outcomes else 1
-                                
-                                market_end_time = (slot + 900) * 1000
-                                
-                                logger.info(f"Found market: {slug}")
-                                return {
-                                    "slug": slug,
-                                    "question": market.get("question", event.get("title", slug)),
-                                    "condition_id": market.get("conditionId"),
-                                    "up_token_id": clob_token_ids[up_index],
-                                    "down_token_id": clob_token_ids[down_index],
-                                    "end_time": market_end_time,
-                                    "neg_risk": market.get("negRisk", True),
-                                }
-        except Exception as e:
-            logger.debug(f"Error checking {slug}: {e}")
-            continue
+    with ThreadPoolExecutor(max_workers=len(slots_to_try)) as executor:
+        futures = [executor.submit(_probe_slot, crypto_slug, slot) for slot in slots_to_try]
+        for future in futures:
+            market = future.result()
+            if market:
+                for other in futures:
+                    other.cancel()
+                logger.info(f"Found market: {market['slug']}")
+                return market
     
     return None
 
@@ -1316,11 +1487,14 @@ def init_client():
         else:
             client = ClobClient(HOST, key=PRIVATE_KEY, chain_id=CHAIN_ID, signature_type=2, funder=FUNDER_ADDRESS)
         
+        _pool_clob_http()
+        
         if POLY_API_KEY and POLY_API_SECRET and POLY_API_PASSPHRASE:
             from py_clob_client.clob_types import ApiCreds
             creds = ApiCreds(api_key=POLY_API_KEY, api_secret=POLY_API_SECRET, api_passphrase=POLY_API_PASSPHRASE)
         else:
-            creds = client.create_or_derive_api_creds()
+            from clob_creds import get_api_creds
+            creds = get_api_creds(client, SIGNATURE_TYPE)
         
         client.set_api_creds(creds)
         logger.info("Client initialized successfully")
@@ -1331,6 +1505,38 @@ def init_client():
         return None
 
 
+def post_order(client, signed_order, order_type):
+    """client.post_order(), re-deriving cached API creds once if the API rejects them (401)."""
+    try:
+        return client.post_order(signed_order, order_type)
+    except Exception as e:
+        from clob_creds import is_auth_error, refresh_api_creds
+        # Creds from POLY_API_* are not ours to replace
+        if not is_auth_error(e) or (POLY_API_KEY and POLY_API_SECRET and POLY_API_PASSPHRASE):
+            raise
+        logger.warning(f"CLOB API creds rejected ({e}), re-deriving and retrying")
+        refresh_api_creds(client, SIGNATURE_TYPE)
+        return client.post_order(signed_order, order_type)
+
+
+def prewarm_order_caches(client, market_data):
+    """Fill the client's per-token order metadata caches for both sides.
+    
+    create_order looks up tick size and neg-risk (and fee rate, on newer
+    py-clob-client) over REST the first time it sees a token. Doing it on
+    market entry keeps those round-trips off the first order's critical path.
+    """
+    for token_id in (market_data["up_token_id"], market_data["down_token_id"]):
+        for lookup in ("get_tick_size", "get_neg_risk", "get_fee_rate_bps"):
+            fn = getattr(client, lookup, None)
+            if fn is None:
+                continue
+            try:
+                fn(token_id)
+            except Exception as e:
+                logger.debug(f"Order cache prewarm {lookup} failed: {e}")
+
+
 def start_chainlink_ws(crypto_symbol="btc/usd"):
     """Start Polymarket RTDS WebSocket for Chainlink crypto price.
     
@@ -1343,21 +1549,25 @@ def start_chainlink_ws(crypto_symbol="btc/usd"):
     
     def on_message(ws, message):
         try:
-            data = json.loads(message)
+            data = _json_loads(message)
             # RTDS Chainlink format: {"topic": "crypto_prices_chainlink", "payload": {"symbol": "btc/usd", "value": 104567.89}}
             if data.get("topic") == "crypto_prices_chainlink":
                 payload = data.get("payload", {})
                 if payload.get("symbol") == crypto_symbol:
                     crypto_price = float(payload.get("value", 0))
                     # Round to integers as requested
-                    price_state.btc_price = round(crypto_price)  # Keep field name for backward compat
+                    rounded_price = round(crypto_price)
+                    price_changed = rounded_price != price_state.btc_price
+                    price_state.btc_price = rounded_price  # Keep field name for backward compat
                     price_state.last_binance_update = time.time()  # Keep field name for compat
                     price_state.last_update = time.time()
                     
                     # Fix start price for deviation tracking
-                    tracker.set_start_btc_price(round(crypto_price))
-        except:
-            pass
+                    tracker.set_start_btc_price(rounded_price)
+                    if price_changed:
+                        notify_price_tick()
+        except (ValueError, TypeError, AttributeError):
+            pass  # Malformed or non-price message
     
     def on_error(ws, error):
         logger.error(f"Chainlink WS error: {error}")
@@ -1383,6 +1593,7 @@ def start_chainlink_ws(crypto_symbol="btc/usd"):
     def run_ws():
         global binance_ws
         logger.info("Chainlink WS loop starting")
+        tune_ws_thread("Chainlink WS")
         
         while True:
             if shutdown_requested:
@@ -1424,10 +1635,11 @@ def start_user_channel_ws():
     
     def on_message(ws, message):
         try:
-            data = json.loads(message)
+            data = _json_loads(message)
             event_type = data.get("event_type", "")
             
-            logger.debug(f"User WS: {event_type} - {json.dumps(data)[:200]}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("User WS: %s - %.200s", event_type, message)  # Raw frame, no re-serialization
             
             # Handle trade events
             if event_type == "trade":
@@ -1441,12 +1653,8 @@ def start_user_channel_ws():
                 
                 side = tracker.token_to_side.get(asset_id, "?")
                 
-                # Find matching position by taker_order_id first (this is the CLOB orderID)
-                matched_pos = None
-                for pos in tracker.open_positions:
-                    if pos.get("trade_id") == taker_order_id:
-                        matched_pos = pos
-                        break
+                # Find matching position by taker_order_id (this is the CLOB orderID)
+                matched_pos = tracker.positions_by_order.get(taker_order_id) if taker_order_id else None
                 
                 if status == "MATCHED":
                     logger.info(f"Trade MATCHED: {side} ${size} @ {price} (order: {taker_order_id[:20] if taker_order_id else 'N/A'}...)")
@@ -1510,7 +1718,9 @@ def start_user_channel_ws():
         logger.info("User Channel subscribed")
     
     def run_ws():
-        while True:
+        global user_ws
+        tune_ws_thread("User WS")
+        while not shutdown_requested:
             try:
                 ws = websocket.WebSocketApp(
                     POLYMARKET_USER_WS,
@@ -1519,10 +1729,18 @@ def start_user_channel_ws():
                     on_close=on_close,
                     on_open=on_open
                 )
+                user_ws = ws  # For shutdown handling
                 ws.run_forever()
             except Exception as e:
                 logger.error(f"User WS reconnect: {e}")
+            finally:
+                user_ws = None
+            
+            if shutdown_requested:
+                break
             time.sleep(3)
+        
+        logger.info("User WS loop exited cleanly")
     
     thread = threading.Thread(target=run_ws, daemon=True)
     thread.start()
@@ -1550,13 +1768,16 @@ def place_order(client, market_data, side):
     
     # OrderArgs expects: size = CONTRACT COUNT, price = price per contract
     # Library internally calculates: maker_amount = size * price (USDC)
-    # Round price UP to 2 decimals to ensure limit >= ask (order fills)
-    import math
+    # Round price UP to 2 decimals to ensure limit >= ask (order fills).
+    # Done in integer ticks: math.ceil(ask * 100) on a float turns 0.07
+    # (7.000000000000001) into 0.08.
     contracts = current_contracts_size
-    normalized_price = math.ceil(ask_price * 100) / 100  # Round UP to 2 decimals
+    ask_ticks = round(ask_price * PRICE_TICKS)
+    price_cents = -(-ask_ticks // 10)  # Ceil to a whole cent
+    normalized_price = price_cents / 100
     
     # Polymarket minimum order is $1 - adjust contracts if needed
-    min_contracts_for_dollar = math.ceil(1.0 / normalized_price)
+    min_contracts_for_dollar = -(-100 // price_cents)  # ceil($1 / price)
     if contracts < min_contracts_for_dollar:
         contracts = min_contracts_for_dollar
         logger.info(f"Adjusted to {contracts} contracts (min $1 order)")
@@ -1578,7 +1799,7 @@ def place_order(client, market_data, side):
         signed_order = client.create_order(order_args)
         # Use selected order mode (FOK = full fill only, FAK = partial fills OK)
         selected_order_type = OrderType.FAK if order_mode == "FAK" else OrderType.FOK
-        result = client.post_order(signed_order, selected_order_type)
+        result = post_order(client, signed_order, selected_order_type)
         
         elapsed = int((time.time() - start_time) * 1000)
         
@@ -1625,20 +1846,12 @@ def sell_all_position(client, market_data, side):
     
     token_id = market_data["up_token_id"] if side == "UP" else market_data["down_token_id"]
     
-    # CTF contract address and ABI for balanceOf
-    CTF_ADDRESS = "0x4D97DCd97eC945f40cF65F87097ACe5EA0476045"
-    CTF_ABI = [{"inputs": [{"name": "_owner", "type": "address"}, {"name": "_id", "type": "uint256"}], 
-                "name": "balanceOf", "outputs": [{"name": "", "type": "uint256"}], 
-                "stateMutability": "view", "type": "function"}]
-    
     try:
         # Get wallet address based on SIGNATURE_TYPE
-        from eth_account import Account
-        
         # For SIGNATURE_TYPE 0: tokens on PRIVATE_KEY address
         # For SIGNATURE_TYPE 1/2: tokens on FUNDER_ADDRESS (proxy wallet)
         if SIGNATURE_TYPE == 0:
-            wallet = Account.from_key(PRIVATE_KEY).address
+            wallet = _signer_address()
         else:
             if not FUNDER_ADDRESS:
                 print_status(f"SIGNATURE_TYPE={SIGNATURE_TYPE} requires FUNDER_ADDRESS", "error")
@@ -1651,9 +1864,7 @@ def sell_all_position(client, market_data, side):
         
         # Query token balance (with small delay to ensure blockchain state updated)
         time.sleep(0.3)
-        RPC_URL = os.getenv("RPC_URL", "https://polygon-mainnet.g.alchemy.com/v2/IZ9LcPHnEBGEAQxYrTZkk")
-        w3 = Web3(Web3.HTTPProvider(RPC_URL, request_kwargs={'timeout': 10}))
-        ctf = w3.eth.contract(address=Web3.to_checksum_address(CTF_ADDRESS), abi=CTF_ABI)
+        ctf = _ctf_contract()
         
         balance_raw = ctf.functions.balanceOf(Web3.to_checksum_address(wallet), int(token_id)).call()
         balance = balance_raw / 1e6  # Convert from raw to USDC decimals
@@ -1684,7 +1895,7 @@ def sell_all_position(client, market_data, side):
         )
         
         signed_order = client.create_order(order_args)
-        result = client.post_order(signed_order, OrderType.FOK)
+        result = post_order(client, signed_order, OrderType.FOK)
         
         elapsed = int((time.time() - start_time) * 1000)
         
@@ -1778,7 +1989,7 @@ def display_dashboard(market_data):
     
     # Get analysis data
     analysis = tracker.get_paired_analysis()
-    recommendation = tracker.get_buy_recommendation(up_ask, down_ask)
+    recommendation = tracker.get_buy_recommendation(up_ask, down_ask, analysis)
     
     up_contracts = analysis["up_contracts"]
     down_contracts = analysis["down_contracts"]
@@ -2085,30 +2296,32 @@ def adjust_contracts_size(delta):
     add_message(f"Size: {current_contracts_size} contracts", "info")
 
 
-def get_key_with_timeout(timeout=0.5):
-    """Get single keypress with timeout (non-blocking)."""
-    try:
-        import termios
-        import tty
-        import select
-        
-        fd = sys.stdin.fileno()
-        old_settings = termios.tcgetattr(fd)
-        try:
-            tty.setraw(fd)
-            ready, _, _ = select.select([sys.stdin], [], [], timeout)
-            if ready:
-                ch = sys.stdin.read(1)
-                return ch
-            return None
-        finally:
-            termios.tcsetattr(fd, termios.TCSADRAIN, old_settings)
-    except ImportError:
-        import msvcrt
+def get_key_with_timeout(timeout=0.5, wake_fd=None):
+    """Get single keypress with timeout (non-blocking).
+    
+    If wake_fd is given, data on it (see notify_price_tick) ends the wait
+    early and None is returned.
+    """
+    if termios is None:
         if msvcrt.kbhit():
             return msvcrt.getch().decode("utf-8", errors="ignore")
-        time.sleep(timeout)
+        time.sleep(min(timeout, 0.3))  # No wake pipe on Windows - keep polling
+        return None
+    
+    fd = sys.stdin.fileno()
+    old_settings = termios.tcgetattr(fd)
+    try:
+        tty.setraw(fd)
+        watch = [sys.stdin] if wake_fd is None else [sys.stdin, wake_fd]
+        ready, _, _ = select.select(watch, [], [], timeout)
+        if sys.stdin in ready:
+            ch = sys.stdin.read(1)
+            return ch
+        if ready:
+            os.read(wake_fd, 512)  # Drain wakeups
         return None
+    finally:
+        termios.tcsetattr(fd, termios.TCSADRAIN, old_settings)
 
 
 PID_FILE = os.path.join(os.path.dirname(__file__), ".trade.pid")
@@ -2133,7 +2346,7 @@ def check_already_running() -> bool:
                 return True
             logger.info(f"Stale PID file found (pid {old_pid} not running), removing")
             os.remove(PID_FILE)
-        except:
+        except (OSError, ValueError):
             pass
     return False
 
@@ -2156,7 +2369,7 @@ def remove_pid():
         if os.path.exists(PID_FILE):
             os.remove(PID_FILE)
             logger.info("PID file removed")
-    except:
+    except OSError:
         pass
 
 
@@ -2202,12 +2415,8 @@ def cleanup_on_exit():
     global shutdown_requested
     shutdown_requested = True
     
-    # Stop WebSocket feeds
-    if polymarket_feed:
-        try:
-            polymarket_feed.stop()
-        except:
-            pass
+    # Stop WebSocket feeds (their threads exit instead of reconnecting)
+    close_ws_feeds()
     
     # Remove PID file
     remove_pid()
@@ -2268,7 +2477,6 @@ def main():
     
     save_pid()
     
-    import atexit
     atexit.register(remove_pid)
     
     os.system("clear" if os.name != "nt" else "cls")
@@ -2317,10 +2525,11 @@ def main():
     start_chainlink_ws(SELECTED_CRYPTO_SYMBOL)  # Polymarket RTDS Chainlink for crypto price
     polymarket_feed.start(market_data["up_token_id"], market_data["down_token_id"])
     start_user_channel_ws()
-    time.sleep(1)
-    print_status("Price feeds connected", "success")
-    
-    time.sleep(0.5)
+    threading.Thread(target=prewarm_order_caches, args=(client, market_data), daemon=True).start()
+    if polymarket_feed.snapshot_ready.wait(timeout=FEED_READY_TIMEOUT):
+        print_status("Price feeds connected", "success")
+    else:
+        print_status("Price feeds connecting (no orderbook yet)", "warn")
     
     # Flush any buffered input before main loop
     flush_stdin()
@@ -2331,9 +2540,16 @@ def main():
     old_market_data = None  # Store full market data for redeem
     had_positions = False   # Track if we had positions before market close
     position_check_done = False  # Flag to check positions only once near close
+    last_draw = 0.0
     
     while not shutdown_requested:
-        display_dashboard(market_data)
+        # Redraw on a feed tick or keypress, otherwise once a second for the countdown
+        since_draw = time.time() - last_draw
+        if since_draw >= DASHBOARD_REFRESH or (price_tick.is_set() and since_draw >= DASHBOARD_MIN_INTERVAL):
+            price_tick.clear()
+            display_dashboard(market_data)
+            last_draw = time.time()
+            since_draw = 0.0
         
         now_ms = int(time.time() * 1000)
         now_sec = time.time()
@@ -2414,6 +2630,7 @@ def main():
                     })
                     logger.info(f"Archived: {pos['side']} ${pos['size']} @ {pos['price']}")
                 tracker.open_positions.clear()
+                tracker.positions_by_order.clear()
             
             print_status("Market expired, searching...", "warn")
             new_market = find_active_market(SELECTED_CRYPTO_SLUG)
@@ -2436,12 +2653,17 @@ def main():
                     new_market["up_token_id"],
                     new_market["down_token_id"]
                 )
+                threading.Thread(target=prewarm_order_caches, args=(client, new_market), daemon=True).start()
                 
                 print_status(f"Switched: {market_data['slug']}", "success")
             continue
         
         try:
-            key = get_key_with_timeout(timeout=0.3)
+            if price_tick.is_set():
+                # Tick arrived too soon after the last redraw - wait out the rest of the interval
+                key = get_key_with_timeout(timeout=max(0.0, DASHBOARD_MIN_INTERVAL - since_draw))
+            else:
+                key = get_key_with_timeout(timeout=DASHBOARD_REFRESH, wake_fd=_wake_r)
         except Exception as e:
             logger.error(f"Key input error: {e}")
             continue
@@ -2449,6 +2671,7 @@ def main():
         if key is None:
             continue
         
+        last_draw = 0.0  # Show the result of the keypress on the next pass
         key = key.lower()
         
         if key == "1":